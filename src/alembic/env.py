@@ -17,11 +17,13 @@ from dotenv import load_dotenv
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 1) Make the project importable from here (alembic/ is a subfolder).
-#    This lets us `import database` and `import models`.
+#    The app is the `src` package (its modules use relative imports), so the
+#    repository root goes on sys.path and we import `src.database`/`src.models`.
 # ──────────────────────────────────────────────────────────────────────────────
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
+REPO_ROOT = PROJECT_ROOT.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 2) Load environment variables BEFORE importing app modules.
@@ -35,8 +37,8 @@ load_dotenv(PROJECT_ROOT / ".env")
 #    - Base.metadata: target for autogenerate.
 #    - Importing `models` registers all mapped classes with Base.metadata.
 # ──────────────────────────────────────────────────────────────────────────────
-from database import Base, POSTGRES_DB_URL
-import models  # ensure models are imported
+from src.database import Base, POSTGRES_DB_URL
+from src import models  # noqa: F401  ensure models are imported
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 4) Alembic configuration: override alembic.ini URL with our runtime URL.
@@ -47,6 +49,22 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# Full-text search objects are created by DDL events, not mapped (see models.py):
+# keep autogenerate from proposing to drop them.
+UNMAPPED_SEARCH_OBJECTS = {
+    models.SEARCH_VECTOR_COLUMN,
+    models.SEARCH_VECTOR_INDEX,
+    models.SEARCH_FTS_TABLE,
+}
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    if reflected and compare_to is None:
+        return name not in UNMAPPED_SEARCH_OBJECTS and not (
+            type_ == "table" and name.startswith(f"{models.SEARCH_FTS_TABLE}_")
+        )
+    return True
+
 
 def run_migrations_offline() -> None:
     """
@@ -61,6 +79,7 @@ def run_migrations_offline() -> None:
         dialect_opts={"paramstyle": "named"},
         compare_type=True,  # detect column type changes
         compare_server_default=True,  # detect server default changes
+        include_object=include_object,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -75,6 +94,7 @@ def run_migrations_online() -> None:
             target_metadata=target_metadata,
             compare_type=True,
             compare_server_default=True,
+            include_object=include_object,
         )
         with context.begin_transaction():
             context.run_migrations()
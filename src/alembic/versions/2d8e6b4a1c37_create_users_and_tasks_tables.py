@@ -0,0 +1,61 @@
+"""Create users and tasks tables
+
+Revision ID: 2d8e6b4a1c37
+Revises: 
+Create Date: 2026-10-17 00:12:08.530614
+
+The tables used to be created by `Base.metadata.create_all` when the app was
+imported; this revision creates them as they were before the later ones.
+A database created by create_all but never stamped already has the current
+schema: run `alembic stamp head` on it once instead of upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8e6b4a1c37'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('first_name', sa.String(), nullable=True),
+        sa.Column('last_name', sa.String(), nullable=True),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('role', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('username'),
+    )
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+    op.create_table(
+        'tasks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('details', sa.String(), nullable=True),
+        sa.Column('priority', sa.Integer(), nullable=True),
+        sa.Column('is_complete', sa.Boolean(), nullable=True),
+        sa.Column('owner_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tasks_id', 'tasks', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_id', table_name='tasks')
+    op.drop_table('tasks')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_table('users')
@@ -0,0 +1,56 @@
+"""Add composite owner indexes to tasks
+
+Revision ID: 4b1f0c2d9e7a
+Revises: 719a74018ce2
+Create Date: 2026-10-16 23:05:12.481337
+
+Indexes are built with CREATE INDEX CONCURRENTLY outside the migration
+transaction, so writes to `tasks` are not blocked while they build. If a
+concurrent build fails it leaves an INVALID index behind: drop it and re-run.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b1f0c2d9e7a'
+down_revision: Union[str, Sequence[str], None] = '719a74018ce2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TASKS_INDEXES = {
+    'ix_tasks_owner_id_id': ['owner_id', 'id'],
+    'ix_tasks_owner_id_priority_id': ['owner_id', 'priority', 'id'],
+    'ix_tasks_owner_id_is_complete_priority_id': [
+        'owner_id', 'is_complete', 'priority', 'id'
+    ],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns in TASKS_INDEXES.items():
+            op.create_index(
+                name,
+                'tasks',
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in TASKS_INDEXES:
+            op.drop_index(
+                name,
+                table_name='tasks',
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
@@ -1,7 +1,7 @@
 """Create phone number for user columns
 
 Revision ID: 719a74018ce2
-Revises: 
+Revises: 2d8e6b4a1c37
 Create Date: 2025-08-21 20:52:32.144648
 
 """
@@ -13,7 +13,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision: str = '719a74018ce2'
-down_revision: Union[str, Sequence[str], None] = None
+down_revision: Union[str, Sequence[str], None] = '2d8e6b4a1c37'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
@@ -0,0 +1,32 @@
+"""Add tasks_version to users
+
+Revision ID: 9c3e5a7f1b20
+Revises: 4b1f0c2d9e7a
+Create Date: 2026-10-16 23:20:41.903215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e5a7f1b20'
+down_revision: Union[str, Sequence[str], None] = '4b1f0c2d9e7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant server default makes this a metadata-only change on Postgres 11+
+    op.add_column(
+        'users',
+        sa.Column('tasks_version', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'tasks_version')
@@ -0,0 +1,98 @@
+"""Add full-text search over tasks
+
+Revision ID: b3d5f7a9c1e4
+Revises: e5b7c9d1f3a2
+Create Date: 2026-10-17 01:12:40.563218
+
+PostgreSQL: a generated `search_vector` tsvector column (title weighted A,
+details B) with a GIN index. Adding a stored generated column rewrites the
+tasks table under an exclusive lock, so run this off-peak; the index is then
+built with CREATE INDEX CONCURRENTLY, outside the migration transaction.
+
+SQLite: an external-content FTS5 table kept in sync by triggers, filled from
+the existing tasks.
+
+Neither is mapped on the model (see the DDL events in models.py).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d5f7a9c1e4'
+down_revision: Union[str, Sequence[str], None] = 'e5b7c9d1f3a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_TRIGGERS = {
+    'tasks_fts_insert': (
+        "AFTER INSERT ON tasks BEGIN "
+        "INSERT INTO tasks_fts (rowid, title, details) "
+        "VALUES (new.id, new.title, new.details); END"
+    ),
+    'tasks_fts_delete': (
+        "AFTER DELETE ON tasks BEGIN "
+        "INSERT INTO tasks_fts (tasks_fts, rowid, title, details) "
+        "VALUES ('delete', old.id, old.title, old.details); END"
+    ),
+    'tasks_fts_update': (
+        "AFTER UPDATE OF title, details ON tasks BEGIN "
+        "INSERT INTO tasks_fts (tasks_fts, rowid, title, details) "
+        "VALUES ('delete', old.id, old.title, old.details); "
+        "INSERT INTO tasks_fts (rowid, title, details) "
+        "VALUES (new.id, new.title, new.details); END"
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(details, '')), 'B')"
+            ") STORED"
+        )
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_tasks_search_vector',
+                'tasks',
+                ['search_vector'],
+                unique=False,
+                if_not_exists=True,
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+            )
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+            "title, details, content='tasks', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        for name, body in SQLITE_TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        op.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                'ix_tasks_search_vector',
+                table_name='tasks',
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+        op.drop_column('tasks', 'search_vector')
+    elif dialect == 'sqlite':
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS tasks_fts")
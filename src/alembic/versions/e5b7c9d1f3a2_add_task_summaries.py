@@ -0,0 +1,53 @@
+"""Add task_summaries counters
+
+Revision ID: e5b7c9d1f3a2
+Revises: 9c3e5a7f1b20
+Create Date: 2026-10-17 00:41:27.118903
+
+Creates the per-owner counters table and fills it from the existing tasks;
+from then on every task write keeps it up to date. Writes running while this
+migrates are caught by the repair job (python -m src.jobs.repair_task_summaries).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b7c9d1f3a2'
+down_revision: Union[str, Sequence[str], None] = '9c3e5a7f1b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COUNTER_COLUMNS = ['total', 'completed'] + [f'priority_{p}' for p in range(1, 6)]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'task_summaries',
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        *(
+            sa.Column(column, sa.Integer(), server_default='0', nullable=False)
+            for column in COUNTER_COLUMNS
+        ),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('owner_id'),
+    )
+    priority_counts = ', '.join(
+        f'SUM(CASE WHEN priority = {p} THEN 1 ELSE 0 END)' for p in range(1, 6)
+    )
+    op.execute(
+        f"INSERT INTO task_summaries (owner_id, {', '.join(COUNTER_COLUMNS)}) "
+        "SELECT owner_id, COUNT(*), "
+        "SUM(CASE WHEN is_complete THEN 1 ELSE 0 END), "
+        f"{priority_counts} "
+        "FROM tasks WHERE owner_id IS NOT NULL GROUP BY owner_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_summaries')
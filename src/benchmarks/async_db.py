@@ -0,0 +1,126 @@
+"""
+Concurrent-request benchmark: blocking sync Session vs AsyncSession.
+
+Serves two otherwise identical endpoints from a single uvicorn worker (in a
+background thread, so the client's event loop is never blocked by the server's)
+and drives them with many concurrent requests. Each request runs one query that takes `--query-delay`
+seconds on the server (`pg_sleep`), which is what a slow query looks like to
+the event loop.
+
+- "sync"  : the old pattern, a psycopg2 Session called inside `async def`
+- "async" : the current pattern, an asyncpg-backed AsyncSession
+
+Usage (from the repository root, with the PG* variables from `.env` set):
+    python -m src.benchmarks.async_db --requests 500 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import socket
+import threading
+import time
+
+import httpx
+import uvicorn
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from ..database import POSTGRES_DB_URL, get_db
+
+
+def build_app(query_delay: float) -> FastAPI:
+    app = FastAPI()
+    # Same engine setup the app used before the async port
+    SyncSessionLocal = sessionmaker(
+        bind=create_engine(POSTGRES_DB_URL, pool_pre_ping=True)
+    )
+    query = text("SELECT pg_sleep(:delay)")
+
+    @app.get("/sync")
+    async def sync_endpoint():
+        with SyncSessionLocal() as db_session:
+            db_session.execute(query, {"delay": query_delay})  # blocks the loop
+        return {"ok": True}
+
+    @app.get("/async")
+    async def async_endpoint(db_session: AsyncSession = Depends(get_db)):
+        await db_session.execute(query, {"delay": query_delay})
+        return {"ok": True}
+
+    return app
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def start_server(app: FastAPI) -> tuple[uvicorn.Server, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def run_mode(
+    base_url: str, path: str, total_requests: int, concurrency: int
+) -> dict:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as c:
+
+        async def one_request():
+            async with semaphore:
+                t0 = time.perf_counter()
+                response = await c.get(path)
+                latencies.append(time.perf_counter() - t0)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(total_requests)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "mode": path.strip("/"),
+        "requests": total_requests,
+        "throughput_rps": total_requests / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    server, base_url = start_server(build_app(args.query_delay))
+    results = []
+    for path in ("/sync", "/async"):
+        results.append(
+            await run_mode(base_url, path, args.requests, args.concurrency)
+        )
+    server.should_exit = True
+
+    print(f"{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for r in results:
+        print(
+            f"{r['mode']:<8}{r['throughput_rps']:>10.1f}"
+            f"{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--query-delay", type=float, default=0.01)
+    asyncio.run(main(parser.parse_args()))
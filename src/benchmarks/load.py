@@ -0,0 +1,318 @@
+"""
+Load test: throughput and p50/p95/p99 latency per route under a traffic mix.
+
+Virtual users log in, seed a few tasks, then loop over a weighted mix of
+login, task list, task read, create, update and delete requests until
+`--requests` requests have been sent. Results are printed per route, can be
+saved as JSON (`--output`) and compared against a saved run (`--baseline`);
+the exit code is 1 when any route regressed by more than `--tolerance`.
+
+Targets:
+- in-process (default): the ASGI app through httpx's ASGITransport, on a
+  throwaway SQLite file (in a temporary directory, deleted after the run),
+  or on any async SQLAlchemy URL (`--database-url`,
+  e.g. a local Postgres: postgresql+asyncpg://postgres@localhost/listo_bench)
+- a running server (`--url http://127.0.0.1:8000`), using its own database;
+  raise its RATE_LIMIT_* settings, or logins from here get 429s
+
+Usage (from the repository root):
+    python -m src.benchmarks.load --requests 2000 --concurrency 20 \\
+        --output bench.json
+    python -m src.benchmarks.load --baseline bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from ..database import Base, get_db, get_sessionmaker
+from .async_db import percentile
+
+DEFAULT_MIX = "list=55,get=10,create=15,update=10,delete=5,login=5"
+USER_PASSWORD = "bench-password"
+
+
+# Target setup
+def in_process_app(database_url: str):
+    from ..main import create_app
+    from ..utils.rate_limit import ip_rate_limiter, username_rate_limiter
+
+    app = create_app()
+    # Virtual users share one client address and log in over and over
+    ip_rate_limiter.burst = username_rate_limiter.burst = 0
+    engine = create_async_engine(database_url, poolclass=NullPool)
+    session_factory = async_sessionmaker(
+        bind=engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def override_get_db():
+        async with session_factory() as db_session:
+            yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_sessionmaker] = lambda: session_factory
+    return app, engine
+
+
+async def create_schema(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+# Traffic
+class VirtualUser:
+    """One logged-in client with its own tasks to read, update and delete."""
+
+    def __init__(self, client: httpx.AsyncClient, index: int, run_id: str):
+        self.client = client
+        self.username = f"bench_{run_id}_{index}"
+        self.task_ids: list[int] = []
+        self.cookies: dict[str, str] = {}
+
+    async def sign_up(self) -> None:
+        response = await self.client.post(
+            "/api/users",
+            json={
+                "username": self.username,
+                "email": f"{self.username}@bench.example.com",
+                "first_name": "Bench",
+                "last_name": "User",
+                "password": USER_PASSWORD,
+            },
+        )
+        if response.status_code not in (201, 409):
+            response.raise_for_status()
+
+    async def login(self) -> httpx.Response:
+        response = await self.client.post(
+            "/api/token", data={"username": self.username, "password": USER_PASSWORD}
+        )
+        # The auth cookies are `Secure`, so pass them explicitly to work on http
+        if response.status_code == 200:
+            self.cookies = {"access_token": response.cookies["access_token"]}
+        return response
+
+    async def seed(self, count: int) -> None:
+        if count <= 0:
+            return
+        response = await self.client.post(
+            "/api/tasks/bulk",
+            json=[{"title": f"seed {i}", "priority": i % 5 + 1} for i in range(count)],
+            cookies=self.cookies,
+        )
+        response.raise_for_status()
+        self.task_ids += [task["id"] for task in response.json()["created"]]
+
+    async def run(self, op: str) -> tuple[str, httpx.Response]:
+        """Sends one request of kind `op`; returns its route label and response."""
+        if op in ("get", "update", "delete") and not self.task_ids:
+            op = "create"
+
+        if op == "login":
+            return "POST /api/token", await self.login()
+        if op == "list":
+            response = await self.client.get(
+                "/api/tasks", params={"limit": 50}, cookies=self.cookies
+            )
+            return "GET /api/tasks", response
+        if op == "get":
+            task_id = random.choice(self.task_ids)
+            response = await self.client.get(
+                f"/api/tasks/{task_id}", cookies=self.cookies
+            )
+            return "GET /api/tasks/{task_id}", response
+        if op == "create":
+            response = await self.client.post(
+                "/api/tasks",
+                json={"title": "bench task", "priority": random.randint(1, 5)},
+                cookies=self.cookies,
+            )
+            if response.status_code < 300:
+                self.task_ids.append(response.json()["id"])
+            return "POST /api/tasks", response
+        if op == "update":
+            task_id = random.choice(self.task_ids)
+            response = await self.client.put(
+                f"/api/tasks/{task_id}",
+                json={"is_complete": random.random() < 0.5},
+                cookies=self.cookies,
+            )
+            return "PUT /api/tasks/{task_id}", response
+        if op == "delete":
+            task_id = self.task_ids.pop(random.randrange(len(self.task_ids)))
+            response = await self.client.delete(
+                f"/api/tasks/{task_id}", cookies=self.cookies
+            )
+            return "DELETE /api/tasks/{task_id}", response
+        raise ValueError(f"unknown operation {op!r}")
+
+
+def parse_mix(mix: str) -> tuple[list[str], list[float]]:
+    ops, weights = [], []
+    for part in mix.split(","):
+        op, _, weight = part.partition("=")
+        ops.append(op.strip())
+        weights.append(float(weight))
+    return ops, weights
+
+
+async def drive(client: httpx.AsyncClient, args: argparse.Namespace) -> dict:
+    run_id = f"{int(time.time())}{random.randrange(1000):03d}"
+    users = [VirtualUser(client, i, run_id) for i in range(args.concurrency)]
+    for user in users:
+        await user.sign_up()
+        (await user.login()).raise_for_status()
+        await user.seed(args.seed_tasks)
+
+    ops, weights = parse_mix(args.mix)
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    remaining = args.requests
+
+    async def user_loop(user: VirtualUser):
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            op = random.choices(ops, weights)[0]
+            t0 = time.perf_counter()
+            route, response = await user.run(op)
+            latencies[route].append(time.perf_counter() - t0)
+            if response.status_code >= 400:
+                errors[route] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user_loop(user) for user in users))
+    elapsed = time.perf_counter() - started
+
+    def summarize(samples: list[float], error_count: int) -> dict:
+        return {
+            "count": len(samples),
+            "errors": error_count,
+            "throughput_rps": len(samples) / elapsed,
+            "mean_ms": sum(samples) / len(samples) * 1000,
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+        }
+
+    everything = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "routes": {
+            route: summarize(samples, errors[route])
+            for route, samples in sorted(latencies.items())
+        },
+        "total": summarize(everything, sum(errors.values())),
+        "elapsed_s": elapsed,
+    }
+
+
+# Reporting
+def print_results(results: dict) -> None:
+    print(
+        f"{'route':<30}{'count':>7}{'errors':>8}{'req/s':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    )
+    for route, r in [*results["routes"].items(), ("total", results["total"])]:
+        print(
+            f"{route:<30}{r['count']:>7}{r['errors']:>8}{r['throughput_rps']:>9.1f}"
+            f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}"
+        )
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Returns one line per route whose p95 or throughput regressed."""
+    regressions = []
+    current_routes = {**results["routes"], "total": results["total"]}
+    baseline_routes = {**baseline["routes"], "total": baseline["total"]}
+    for route, base in baseline_routes.items():
+        current = current_routes.get(route)
+        if current is None:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{route}: p95 {base['p95_ms']:.1f} -> {current['p95_ms']:.1f} ms"
+            )
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{route}: throughput {base['throughput_rps']:.1f} -> "
+                f"{current['throughput_rps']:.1f} req/s"
+            )
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> int:
+    engine = scratch_dir = None
+    if args.url:
+        target = args.url
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+    else:
+        target = database_url = args.database_url
+        if database_url is None:
+            # Runs never share data: each gets a fresh file, gone afterwards
+            scratch_dir = tempfile.TemporaryDirectory(prefix="listo_bench_")
+            database_url = f"sqlite+aiosqlite:///{Path(scratch_dir.name, 'bench.db')}"
+            target = "sqlite (temporary file)"
+        app, engine = in_process_app(database_url)
+        await create_schema(engine)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60
+        )
+
+    try:
+        async with client:
+            results = await drive(client, args)
+    finally:
+        if engine is not None:
+            await engine.dispose()
+        if scratch_dir is not None:
+            scratch_dir.cleanup()
+
+    results["meta"] = {
+        "target": target,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "mix": args.mix,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+    }
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="op=weight,...")
+    parser.add_argument("--seed-tasks", type=int, default=20)
+    parser.add_argument("--url", help="benchmark a running server instead")
+    parser.add_argument(
+        "--database-url", help="default: a temporary SQLite file, deleted after"
+    )
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,91 @@
+"""
+Per-item serialization cost of a task list response.
+
+Serializes the same N tasks the way each path in the app does and reports
+the time per item (no database or HTTP involved):
+
+- "orm+validate" : the old path; ORM objects re-validated through
+                   `List[TaskResponse]`, dumped to JSON-able Python, then
+                   encoded with the stdlib `json` (what `response_model` does)
+- "typeadapter"  : column rows dumped by the precompiled TypeAdapter
+- "orjson"       : column rows dumped by orjson (the path the app uses when
+                   orjson is installed)
+
+Usage (from the repository root):
+    python -m src.benchmarks.serialization --items 500 --repeat 200
+"""
+
+import argparse
+import json
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+
+from ..models import Tasks
+from ..request_response_schemas import TaskResponse
+from ..utils.serialization import orjson, task_rows_adapter
+
+
+def make_tasks(count: int) -> list[Tasks]:
+    return [
+        Tasks(
+            id=i,
+            title=f"task_{i}_title",
+            details="Lorem ipsum dolor sit amet, consectetur adipiscing elit.",
+            priority=i % 5 + 1,
+            is_complete=bool(i % 2),
+            owner_id=1,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def per_item_ns(fn, items: int, repeat: int) -> float:
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat / items * 1e9
+
+
+def main(args: argparse.Namespace) -> None:
+    tasks = make_tasks(args.items)
+    rows = [
+        {
+            "title": t.title,
+            "details": t.details,
+            "priority": t.priority,
+            "is_complete": t.is_complete,
+            "id": t.id,
+            "owner_id": t.owner_id,
+        }
+        for t in tasks
+    ]
+    response_adapter = TypeAdapter(List[TaskResponse])
+
+    def orm_validate() -> bytes:
+        validated = response_adapter.validate_python(tasks, from_attributes=True)
+        content = response_adapter.dump_python(validated, mode="json")
+        return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+    modes = {
+        "orm+validate": orm_validate,
+        "typeadapter": lambda: task_rows_adapter.dump_json(rows),
+    }
+    if orjson is not None:
+        modes["orjson"] = lambda: orjson.dumps(rows)
+
+    baseline = None
+    print(f"{'mode':<14}{'ns/item':>10}{'speedup':>10}")
+    for mode, fn in modes.items():
+        ns = per_item_ns(fn, args.items, args.repeat)
+        baseline = baseline or ns
+        print(f"{mode:<14}{ns:>10.0f}{baseline / ns:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    main(parser.parse_args())
@@ -1,11 +1,36 @@
-from sqlalchemy.engine import URL
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Depends, Request
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_session,
+    async_sessionmaker,
+    create_async_engine,
+)
 
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
+from contextvars import ContextVar
 from dotenv import load_dotenv
 from pathlib import Path
+from uuid import uuid4
+import asyncio
+import functools
+import inspect
+import math
 import os
+import time
+
+from .utils.metrics import registry
+from .utils.request_stats import (
+    after_cursor_execute,
+    before_cursor_execute,
+    handle_error,
+)
 
 
 # Production Database Setup (POSTGRES)
@@ -17,6 +42,7 @@ PGHOST = os.getenv("PGHOST")
 PGPORT = os.getenv("PGPORT")
 PGDATABASE = os.getenv("PGDATABASE")
 
+# Sync URL (psycopg2) - used by Alembic (schema management) only
 POSTGRES_DB_URL = URL.create(
     "postgresql+psycopg2",
     username=PGUSER,
@@ -26,15 +52,334 @@ POSTGRES_DB_URL = URL.create(
     database=PGDATABASE,
 )
 
-engine = create_engine(POSTGRES_DB_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# Async URL (asyncpg) - used by the application at request time
+ASYNC_POSTGRES_DB_URL = POSTGRES_DB_URL.set(drivername="postgresql+asyncpg")
+
+# Connection Pool (per worker process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds, -1 = never
+# Pre-ping costs a round trip per checkout but hides connections the server
+# dropped; opt out with "false" if recycling suffices. PgBouncer mode has no
+# app-side pool to ping.
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true")
+DB_POOL_PREWARM = int(os.getenv("DB_POOL_PREWARM", "0"))  # connections at startup
+# Behind PgBouncer in transaction mode: no app-side pool, no prepared statements
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() in ("1", "true")
+
+# Optional read replica, used by read-only endpoints (see get_read_db). Only
+# REPLICA_PGHOST is required; the other settings default to the primary's.
+REPLICA_PGHOST = os.getenv("REPLICA_PGHOST")
+REPLICA_PGPORT = os.getenv("REPLICA_PGPORT", PGPORT)
+ASYNC_REPLICA_DB_URL = (
+    ASYNC_POSTGRES_DB_URL.set(
+        username=os.getenv("REPLICA_PGUSER", PGUSER),
+        password=os.getenv("REPLICA_PGPASSWORD", PGPASSWORD),
+        host=REPLICA_PGHOST,
+        port=int(REPLICA_PGPORT) if REPLICA_PGPORT else None,
+        database=os.getenv("REPLICA_PGDATABASE", PGDATABASE),
+    )
+    if REPLICA_PGHOST
+    else None
+)
+# After a write, the client reads from the primary this long (replica lag)
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+PRIMARY_READS_COOKIE = "db_primary_until"
+
+pool_wait_seconds = registry.histogram(
+    "db_pool_wait_seconds",
+    "Time to check a connection out of the pool.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 10, 30),
+)
+connection_hold_seconds = registry.histogram(
+    "db_connection_hold_seconds",
+    "Time from checking a connection out of the pool to returning it.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 10, 30),
+)
+
+
+class _TimedCheckouts:
+    """Pool mixin recording how long each checkout waits (for NullPool: how
+    long each connect takes)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Metrics
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - started_at
+            self.checkouts += 1
+            self.total_wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            pool_wait_seconds.observe(wait)
+
+    def stats(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds": self.total_wait_seconds,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+        }
+
+
+class TimedAsyncQueuePool(_TimedCheckouts, AsyncAdaptedQueuePool):
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(0, self.overflow()),
+            **super().stats(),
+        }
+
+
+class TimedNullPool(_TimedCheckouts, NullPool):
+    pass
+
+
+def build_engine_kwargs() -> dict:
+    if DB_PGBOUNCER:
+        # Transaction pooling: PgBouncer owns pooling, and a server connection
+        # may change between transactions, so no prepared statements survive.
+        return {
+            "poolclass": TimedNullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        }
+    return {
+        "poolclass": TimedAsyncQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+engine = create_async_engine(ASYNC_POSTGRES_DB_URL, **build_engine_kwargs())
+SessionLocal = async_sessionmaker(
+    bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 Base = declarative_base()
 
+replica_engine = (
+    create_async_engine(ASYNC_REPLICA_DB_URL, **build_engine_kwargs())
+    if ASYNC_REPLICA_DB_URL is not None
+    else None
+)
+ReplicaSessionLocal = (
+    async_sessionmaker(
+        bind=replica_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    if replica_engine is not None
+    else None
+)
+
+# Count and time statements per request on every engine (Server-Timing: db)
+event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+event.listen(Engine, "after_cursor_execute", after_cursor_execute)
+event.listen(Engine, "handle_error", handle_error)
+
 
-def get_db():
-    """Creates a database session to your local db."""
-    db_session = SessionLocal()
+@event.listens_for(Pool, "checkout")
+def _mark_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    connection_record.info["checked_out_at"] = time.perf_counter()
+
+
+@event.listens_for(Pool, "checkin")
+def _observe_hold_time(dbapi_connection, connection_record) -> None:
+    checked_out_at = connection_record.info.pop("checked_out_at", None)
+    if checked_out_at is not None:
+        connection_hold_seconds.observe(time.perf_counter() - checked_out_at)
+
+
+async def get_db():
+    """
+    Creates an async database session to your local db. The session checks
+    out a connection only on its first query, so requests rejected before
+    then (e.g. 401s from the cached user state) never touch the pool.
+    """
+    async with SessionLocal() as db_session:
+        yield db_session
+
+
+def reads_from_primary(request: Request) -> bool:
+    """True while the client is within DB_REPLICA_STICKY_SECONDS of its last
+    write (PRIMARY_READS_COOKIE), so it reads its own writes."""
     try:
+        return float(request.cookies.get(PRIMARY_READS_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def reads_from_replica(request: Request) -> bool:
+    """Whether get_read_db (and get_read_sessionmaker) hand this request the
+    replica, whose data may lag the primary's."""
+    return ReplicaSessionLocal is not None and not reads_from_primary(request)
+
+
+async def get_read_db(request: Request, db_session: AsyncSession = Depends(get_db)):
+    """
+    Session for read-only endpoints: on the replica when one is configured,
+    else (or right after the client wrote something) the primary session from
+    get_db, shared with the request's other dependencies. Sessions connect
+    lazily, so an unused primary session costs no connection, and
+    ReleaseSessionRoute closes both when the endpoint returns.
+    """
+    if not reads_from_replica(request):
         yield db_session
-    finally:
-        db_session.close()
+        return
+    async with ReplicaSessionLocal() as replica_session:
+        yield replica_session
+
+
+def _pool_stats(db_engine) -> dict:
+    stats = db_engine.pool.stats() if hasattr(db_engine.pool, "stats") else {}
+    return {"pool": type(db_engine.pool).__name__, **stats}
+
+
+def pool_stats() -> dict:
+    return _pool_stats(engine)
+
+
+def replica_pool_stats() -> dict:
+    return _pool_stats(replica_engine) if replica_engine is not None else {}
+
+
+async def prewarm_pool(connections: int = DB_POOL_PREWARM) -> int:
+    """Opens up to `connections` pooled connections now instead of on the
+    first requests; returns how many were opened."""
+    if not isinstance(engine.pool, AsyncAdaptedQueuePool):
+        return 0
+    connections = min(connections, DB_POOL_SIZE)
+    if connections <= 0:
+        return 0
+    opened = await asyncio.gather(
+        *(engine.connect().start() for _ in range(connections))
+    )
+    await asyncio.gather(*(conn.close() for conn in opened))
+    return len(opened)
+
+
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Session factory for work that outlives the request (e.g. streamed bodies)."""
+    return SessionLocal
+
+
+def get_read_sessionmaker(
+    request: Request,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_sessionmaker),
+) -> async_sessionmaker[AsyncSession]:
+    """get_sessionmaker, routed like get_read_db."""
+    if not reads_from_replica(request):
+        return session_factory
+    return ReplicaSessionLocal
+
+
+class ReadYourWritesMiddleware:
+    """
+    Sets PRIMARY_READS_COOKIE on every successful write (any request but
+    GET/HEAD/OPTIONS answered below 400), so the client's reads stay on the
+    primary until the replica has caught up. Only needed with a replica.
+    """
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, app: ASGIApp, sticky_seconds: float = DB_REPLICA_STICKY_SECONDS):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.sticky_seconds
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{PRIMARY_READS_COOKIE}={until:.3f}; "
+                    f"Max-Age={math.ceil(self.sticky_seconds)}; Path=/; "
+                    "HttpOnly; Secure; SameSite=None",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# The sessions that began a transaction (checked out a connection) during
+# the current ReleaseSessionRoute request, whichever dependency opened them
+_request_sessions: ContextVar[list[AsyncSession] | None] = ContextVar(
+    "request_sessions", default=None
+)
+
+
+@event.listens_for(Session, "after_begin")
+def _track_request_session(session, transaction, connection) -> None:
+    sessions = _request_sessions.get()
+    proxy = async_session(session)
+    if sessions is not None and proxy is not None and proxy not in sessions:
+        sessions.append(proxy)
+
+
+def _close_sessions_after(endpoint):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            for db_session in _request_sessions.get() or ():
+                await db_session.close()
+
+    return wrapper
+
+
+class ReleaseSessionRoute(APIRoute):
+    """
+    Closes every AsyncSession the request has used (the endpoint's, and any
+    a dependency such as get_current_user queried on its own) as soon as the
+    endpoint returns, so their connections are back in the pool before
+    FastAPI validates and serializes the response, or streams it, and before
+    get_db's teardown runs.
+
+    Returned ORM objects stay readable: expire_on_commit=False keeps them
+    loaded and close() only detaches them. The sessions are still usable by
+    later dependencies; they simply check out a new connection if queried.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _close_sessions_after(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request):
+            token = _request_sessions.set([])
+            try:
+                return await handler(request)
+            finally:
+                _request_sessions.reset(token)
+
+        return route_handler
@@ -0,0 +1,34 @@
+"""
+Rebuild the per-user task counters (task_summaries) from the tasks table.
+
+Every task write keeps the counters up to date in its own transaction; run
+this after changing tasks outside the API (manual SQL, restores), or on a
+schedule to catch any drift. It is also available to admins as
+POST /api/admin/tasks/summaries/repair.
+
+Usage (from the repository root, with the PG* variables from `.env` set):
+    python -m src.jobs.repair_task_summaries
+    python -m src.jobs.repair_task_summaries --owner-id 42
+"""
+
+import argparse
+import asyncio
+
+from ..database import SessionLocal, engine
+from ..utils.task_summary import recompute_task_summaries
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        async with SessionLocal() as db_session:
+            owners = await recompute_task_summaries(db_session, args.owner_id)
+            await db_session.commit()
+    finally:
+        await engine.dispose()
+    print(f"Rebuilt task counters for {owners} owner(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--owner-id", type=int, help="only this user's counters")
+    asyncio.run(main(parser.parse_args()))
@@ -1,39 +1,143 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
-from .database import Base, engine
+from fastapi.responses import PlainTextResponse, RedirectResponse
+import asyncio
+from .database import (
+    ReadYourWritesMiddleware,
+    engine,
+    pool_stats,
+    prewarm_pool,
+    replica_engine,
+    replica_pool_stats,
+)
 from .routers import auth, tasks, admin, users, pages
+from .routers.pages import page_cache
+from .utils.auth import token_claims_cache, user_state_cache
+from .utils.compression import CompressionMiddleware
+from .utils.metrics import (
+    CONTENT_TYPE,
+    MetricsMiddleware,
+    registry,
+    require_metrics_token,
+)
+from .utils.rate_limit import ip_rate_limiter, username_rate_limiter
+from .utils.request_stats import ServerTimingMiddleware
+from .utils.response_cache import task_response_cache, user_response_cache
+from .utils.security import password_hasher
 
+# The schema is managed by Alembic (`alembic upgrade head`, see README): nothing
+# here touches the database at import, so a worker starts even while it is down.
 
-# Initialize App
-app = FastAPI()
 
-# Initialize Dependencies
-Base.metadata.create_all(bind=engine)
+# Scrape-time metrics from components that keep their own stats
+registry.add_stats_collector(
+    "db_pool", pool_stats, counters=("checkouts", "timeouts", "wait_seconds")
+)
+registry.add_stats_collector(
+    "db_replica_pool",
+    replica_pool_stats,
+    counters=("checkouts", "timeouts", "wait_seconds"),
+)
+registry.add_stats_collector(
+    "password_hashing",
+    password_hasher.stats,
+    counters=("completed", "rejected", "wait_seconds", "hash_seconds"),
+)
+registry.add_stats_collector(
+    "user_cache",
+    user_state_cache.stats,
+    counters=("hits", "misses", "evictions", "expirations"),
+)
+registry.add_stats_collector(
+    "token_cache",
+    token_claims_cache.stats,
+    counters=("hits", "misses", "evictions", "expirations"),
+)
+for limiter in (ip_rate_limiter, username_rate_limiter):
+    registry.add_stats_collector(
+        f"rate_limit_{limiter.name}",
+        limiter.stats,
+        counters=("allowed", "rejected", "evictions"),
+    )
+for response_cache in (task_response_cache, user_response_cache):
+    registry.add_stats_collector(
+        f"response_cache_{response_cache.namespace}",
+        response_cache.stats,
+        counters=("hits", "misses", "invalidations", "evictions", "expirations"),
+    )
+registry.add_stats_collector(
+    "page_cache", page_cache.stats, counters=("hits", "misses", "reloads")
+)
 
 
-# Middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "https://listo-gpp5.onrender.com/",
-        "http://127.0.0.1:8000/",
-        "http://localhost:8000/",
-    ],
-    allow_credentials=True,  # ✅ required for cookies
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    page_cache.load()  # raw files only: a few stats and reads
+    # Compressed copies are built off the event loop; until then, first use builds them
+    precompress = asyncio.create_task(asyncio.to_thread(page_cache.precompress))
+    await prewarm_pool()  # DB_POOL_PREWARM connections, 0 by default
+    yield
+    await precompress
+    password_hasher.shutdown()
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
 
-# Route to Sub-Apps
-app.include_router(pages.router)
-app.include_router(auth.router)
-app.include_router(tasks.router)
-app.include_router(admin.router)
-app.include_router(users.router)
+
+# Prometheus Scrape Endpoint (bearer METRICS_TOKEN)
+async def get_metrics():
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
 
 
 # Redirect to Login Page
-@app.get("/", include_in_schema=False)
 async def redirect_to_login():
     return RedirectResponse(url="/ui/login/")
+
+
+def create_app() -> FastAPI:
+    """
+    Builds the application. Startup work (loading pages, prewarming the pool)
+    runs in `lifespan`, once the server starts, rather than at import.
+
+    Run with `uvicorn src.main:app`, or `uvicorn --factory src.main:create_app`.
+    """
+    app = FastAPI(lifespan=lifespan)
+
+    # Middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "https://listo-gpp5.onrender.com/",
+            "http://127.0.0.1:8000/",
+            "http://localhost:8000/",
+        ],
+        allow_credentials=True,  # ✅ required for cookies
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],  # keyset pagination (GET /api/tasks)
+    )
+    if replica_engine is not None:
+        app.add_middleware(ReadYourWritesMiddleware)  # DB_REPLICA_STICKY_SECONDS
+    app.add_middleware(CompressionMiddleware)  # threshold: COMPRESSION_MIN_SIZE
+    app.add_middleware(ServerTimingMiddleware)  # budgets: REQUEST_*_BUDGET*
+    app.add_middleware(MetricsMiddleware)  # outermost, so it times everything
+
+    # Route to Sub-Apps
+    app.include_router(pages.router)
+    app.include_router(auth.router)
+    app.include_router(tasks.router)
+    app.include_router(admin.router)
+    app.include_router(users.router)
+
+    app.add_api_route(
+        "/metrics",
+        get_metrics,
+        dependencies=[Depends(require_metrics_token)],  # off unless METRICS_TOKEN
+        include_in_schema=False,
+    )
+    app.add_api_route("/", redirect_to_login, include_in_schema=False)
+    return app
+
+
+app = create_app()
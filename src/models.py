@@ -1,9 +1,22 @@
 from .database import Base
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import DDL, Column, Integer, String, Boolean, ForeignKey, Index, event
 
 
 class Tasks(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Every tasks query is scoped to one owner; `id` closes each index so
+        # keyset pages (ORDER BY ..., id) are read straight off the index.
+        Index("ix_tasks_owner_id_id", "owner_id", "id"),
+        Index("ix_tasks_owner_id_priority_id", "owner_id", "priority", "id"),
+        Index(
+            "ix_tasks_owner_id_is_complete_priority_id",
+            "owner_id",
+            "is_complete",
+            "priority",
+            "id",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String)
@@ -13,6 +26,55 @@ class Tasks(Base):
     owner_id = Column(Integer, ForeignKey("users.id"))
 
 
+# Full-text search over title and details (see utils/task_search.py). The index
+# is dialect specific, so it is created by DDL events (and its migration), not
+# mapped: PostgreSQL gets a generated tsvector column with a GIN index, SQLite
+# an FTS5 table kept in sync by triggers.
+SEARCH_CONFIG = "english"  # baked into the generated column; changing it migrates
+SEARCH_VECTOR_COLUMN = "search_vector"
+SEARCH_VECTOR_INDEX = "ix_tasks_search_vector"
+SEARCH_FTS_TABLE = "tasks_fts"
+
+for statement in (
+    f"ALTER TABLE tasks ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR_COLUMN} tsvector "
+    "GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(details, '')), 'B')"
+    ") STORED",
+    f"CREATE INDEX IF NOT EXISTS {SEARCH_VECTOR_INDEX} "
+    f"ON tasks USING gin ({SEARCH_VECTOR_COLUMN})",
+):
+    event.listen(
+        Tasks.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
+
+for statement in (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_FTS_TABLE} USING fts5("
+    "title, details, content='tasks', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    f"INSERT INTO {SEARCH_FTS_TABLE} (rowid, title, details) "
+    "VALUES (new.id, new.title, new.details); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    f"INSERT INTO {SEARCH_FTS_TABLE} ({SEARCH_FTS_TABLE}, rowid, title, details) "
+    "VALUES ('delete', old.id, old.title, old.details); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_update "
+    "AFTER UPDATE OF title, details ON tasks BEGIN "
+    f"INSERT INTO {SEARCH_FTS_TABLE} ({SEARCH_FTS_TABLE}, rowid, title, details) "
+    "VALUES ('delete', old.id, old.title, old.details); "
+    f"INSERT INTO {SEARCH_FTS_TABLE} (rowid, title, details) "
+    "VALUES (new.id, new.title, new.details); END",
+):
+    event.listen(
+        Tasks.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Tasks.__table__,
+    "after_drop",
+    DDL(f"DROP TABLE IF EXISTS {SEARCH_FTS_TABLE}").execute_if(dialect="sqlite"),
+)
+
+
 class Users(Base):
     __tablename__ = "users"
 
@@ -25,3 +87,21 @@ class Users(Base):
     is_active = Column(Boolean, default=True)
     role = Column(String)
     phone_number = Column(String)
+    # Bumped by every write to the user's tasks; backs the tasks ETags
+    tasks_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class TaskSummaries(Base):
+    """Per-owner task counters, updated in the transaction of every task write
+    (see utils/task_summary.py) so a summary is a primary-key read."""
+
+    __tablename__ = "task_summaries"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+    completed = Column(Integer, nullable=False, default=0, server_default="0")
+    priority_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    priority_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    priority_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    priority_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    priority_5 = Column(Integer, nullable=False, default=0, server_default="0")
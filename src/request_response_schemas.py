@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, EmailStr, field_validator
-from typing import Optional, ClassVar
+from typing import Annotated, Any, List, Literal, Optional, ClassVar, Union
+from typing_extensions import TypedDict
 import re
 
 
@@ -61,11 +62,88 @@ class UserResponse(BaseModel):
 
 
 class TaskResponse(TaskBase):
+    priority: Optional[int]  # the column is nullable (PUT accepts null)
     is_complete: bool
     id: int
     owner_id: int
 
 
+class TaskSummaryResponse(BaseModel):
+    total: int
+    completed: int
+    by_priority: dict[int, int]  # priority -> number of tasks
+
+
+# Task rows read straight from the tasks table (already valid, never re-validated)
+class TaskRow(TypedDict):
+    title: str
+    details: Optional[str]
+    priority: Optional[int]
+    is_complete: bool
+    id: int
+    owner_id: int
+
+
+# POST /tasks/bulk
+class BulkItemError(BaseModel):
+    index: int  # position of the rejected item in the request body
+    errors: List[dict[str, Any]]
+
+
+class BulkTaskCreateResponse(BaseModel):
+    created: List[TaskResponse]
+    errors: List[BulkItemError]
+
+
+# POST /tasks/batch
+class CreateTaskOperation(BaseModel):
+    op: Literal["create"]
+    task: TaskCreate
+
+
+class UpdateTaskOperation(BaseModel):
+    op: Literal["update"]
+    id: int = Field(..., gt=0)
+    changes: TaskUpdate
+
+
+class DeleteTaskOperation(BaseModel):
+    op: Literal["delete"]
+    id: int = Field(..., gt=0)
+
+
+class CompleteTaskOperation(BaseModel):
+    op: Literal["complete"]
+    id: int = Field(..., gt=0)
+
+
+TaskBatchOperation = Annotated[
+    Union[
+        CreateTaskOperation,
+        UpdateTaskOperation,
+        DeleteTaskOperation,
+        CompleteTaskOperation,
+    ],
+    Field(discriminator="op"),
+]
+
+
+class TaskBatchRequest(BaseModel):
+    operations: List[TaskBatchOperation] = Field(..., min_length=1)
+
+
+class TaskBatchResult(BaseModel):
+    index: int
+    op: str
+    status: int  # HTTP status of this operation on its own (200, 201 or 404)
+    id: Optional[int] = None
+    task: Optional[TaskResponse] = None  # omitted for deletes
+
+
+class TaskBatchResponse(BaseModel):
+    results: List[TaskBatchResult]
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -1,23 +1,50 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from starlette import status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy import select
 
 from ..models import Tasks
-from ..database import get_db
+from ..database import (
+    ReleaseSessionRoute,
+    get_db,
+    get_read_db,
+    get_read_sessionmaker,
+    pool_stats,
+    replica_pool_stats,
+)
 from ..request_response_schemas import TaskResponse
-from ..utils.auth import JwtUser, get_current_user
+from ..utils.auth import (
+    JwtUser,
+    get_current_user,
+    token_claims_cache,
+    user_state_cache,
+)
+from ..utils.rate_limit import ip_rate_limiter, username_rate_limiter
+from ..utils.response_cache import task_response_cache, user_response_cache
+from ..utils.security import password_hasher
+from ..utils.serialization import (
+    TASK_ROW_COLUMNS,
+    TaskRowsResponse,
+    dump_task_rows_ndjson,
+    task_rows,
+)
+from ..utils.task_summary import recompute_task_summaries
+from .pages import page_cache
 
 # Initialize Router
-router = APIRouter(prefix="/api/admin", tags=["Admin"])
+router = APIRouter(prefix="/api/admin", tags=["Admin"], route_class=ReleaseSessionRoute)
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
 
 
 @router.get("/tasks", response_model=List[TaskResponse], status_code=status.HTTP_200_OK)
 async def get_all_tasks(
     user: JwtUser = Depends(get_current_user),
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_read_db),
 ):
     # breakpoint()
     if user is None or user.role != "admin":
@@ -25,5 +52,87 @@ async def get_all_tasks(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed"
         )
 
-    tasks = db_session.execute(select(Tasks)).scalars().all()
-    return tasks
+    tasks = task_rows(await db_session.execute(select(*TASK_ROW_COLUMNS)))
+    return TaskRowsResponse(tasks)
+
+
+@router.get("/tasks/export", status_code=status.HTTP_200_OK)
+async def export_all_tasks(
+    user: JwtUser = Depends(get_current_user),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_read_sessionmaker
+    ),
+    owner_id: Optional[int] = Query(None, gt=0),
+    after_id: Optional[int] = Query(None, ge=0),
+):
+    """
+    Streams every task as NDJSON (one TaskResponse object per line), in id
+    order. Rows come off a server-side cursor in EXPORT_BATCH_SIZE batches, so
+    memory stays flat however large the table is. Pass the last id received
+    as `after_id` to resume an interrupted export.
+    """
+    if user is None or user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed"
+        )
+
+    query = select(*TASK_ROW_COLUMNS).order_by(Tasks.id)
+    if owner_id is not None:
+        query = query.where(Tasks.owner_id == owner_id)
+    if after_id is not None:
+        query = query.where(Tasks.id > after_id)
+
+    async def ndjson_lines():
+        # The request's get_db session is closed before the body is sent, so
+        # the stream owns its session for exactly as long as it runs.
+        async with session_factory() as db_session:
+            result = await db_session.stream(
+                query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            async for batch in result.partitions():
+                yield dump_task_rows_ndjson(task_rows(batch))
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@router.post("/tasks/summaries/repair", status_code=status.HTTP_200_OK)
+async def repair_task_summaries(
+    user: JwtUser = Depends(get_current_user),
+    db_session: AsyncSession = Depends(get_db),
+    owner_id: Optional[int] = Query(None, gt=0),
+):
+    """Rebuilds the task counters of every user (or just `owner_id`) from the
+    tasks table; the same as `python -m src.jobs.repair_task_summaries`."""
+    if user is None or user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed"
+        )
+
+    owners = await recompute_task_summaries(db_session, owner_id)
+    await db_session.commit()
+    return {"owners": owners}
+
+
+@router.get("/stats", status_code=status.HTTP_200_OK)
+async def get_runtime_stats(user: JwtUser = Depends(get_current_user)):
+    if user is None or user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed"
+        )
+
+    return {
+        "password_hashing": password_hasher.stats(),
+        "db_pool": pool_stats(),
+        "db_replica_pool": replica_pool_stats(),
+        "user_cache": user_state_cache.stats(),
+        "token_cache": token_claims_cache.stats(),
+        "rate_limits": {
+            limiter.name: limiter.stats()
+            for limiter in (ip_rate_limiter, username_rate_limiter)
+        },
+        "response_caches": {
+            cache.namespace: cache.stats()
+            for cache in (task_response_cache, user_response_cache)
+        },
+        "page_cache": page_cache.stats(),
+    }
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, Request
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 from datetime import timedelta
 
 
 from ..request_response_schemas import Token
-from ..database import get_db
+from ..database import ReleaseSessionRoute, get_db
 from ..models import Users
 from ..utils.auth import (
     authenticate_user,
@@ -17,19 +17,22 @@ from ..utils.auth import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     REFRESH_TOKEN_EXPIRE_DAYS,
 )
+from ..utils.rate_limit import check_credential_rate_limits
 
 # Router
-router = APIRouter(prefix="/api", tags=["Auth"])
+router = APIRouter(prefix="/api", tags=["Auth"], route_class=ReleaseSessionRoute)
 
 
 # Endpoints
 @router.post("/token", response_model=Token, status_code=status.HTTP_200_OK)
 async def login_for_access_token(
+    request: Request,
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db),
 ):
-    user: None | Users = authenticate_user(
+    await check_credential_rate_limits(request, form_data.username)
+    user: None | Users = await authenticate_user(
         username=form_data.username, password=form_data.password, db_session=db_session
     )
 
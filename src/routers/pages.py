@@ -1,40 +1,79 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from starlette import status
 from pathlib import Path
+import os
 
-router = APIRouter(prefix="/ui", tags=["Login"])
+from ..utils.compression import skip_compression
+from ..utils.http import choose_encoding, etag_matches
+from ..utils.page_cache import PageCache
+
+# Pages are compressed (once) by page_cache, so the middleware stays out of it
+router = APIRouter(
+    prefix="/ui", tags=["Login"], dependencies=[Depends(skip_compression)]
+)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 PAGES_DIR = BASE_DIR / "frontend"
-LOGIN_FILE_PATH = PAGES_DIR / "login.html"
-TASKS_FILE_PATH = PAGES_DIR / "tasks.html"
-ACCOUNT_FILE_PATH = PAGES_DIR / "account.html"
-SIGNUP_FILE_PATH = PAGES_DIR / "signup.html"
+
+# Pages must revalidate (a 304 is cheap); assets may be reused for a while
+PAGES_CACHE_CONTROL = "no-cache"
+ASSETS_CACHE_CONTROL = "public, max-age=3600, must-revalidate"
+
+# Seconds between mtime checks of PAGES_DIR (-1 disables reloading)
+PAGES_RELOAD_INTERVAL_SECONDS = float(os.getenv("PAGES_RELOAD_INTERVAL_SECONDS", "2"))
+
+# Loaded by the app's lifespan (or lazily, on the first lookup)
+page_cache = PageCache(PAGES_DIR, check_interval=PAGES_RELOAD_INTERVAL_SECONDS)
+
+
+def serve_cached_file(request: Request, name: str, cache_control: str) -> Response:
+    cached = page_cache.get(name)
+    if cached is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, f"{name} not found")
+
+    encoding = choose_encoding(
+        request.headers.get("accept-encoding"), page_cache.encodings_for(cached)
+    )
+    etag = (
+        f'"{cached.etag}"' if encoding == "identity" else f'"{cached.etag}-{encoding}"'
+    )
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=page_cache.body(cached, encoding),
+        media_type=cached.media_type,
+        headers=headers,
+    )
 
 
 @router.get("/login")
-async def serve_login_page():
-    if not LOGIN_FILE_PATH.exists():
-        raise HTTPException(404, "login.html not found")
-    return FileResponse(LOGIN_FILE_PATH, media_type="text/html")
+async def serve_login_page(request: Request):
+    return serve_cached_file(request, "login.html", PAGES_CACHE_CONTROL)
 
 
 @router.get("/tasks")
-async def serve_tasks_page():
-    if not TASKS_FILE_PATH.exists():
-        raise HTTPException(404, "tasks.html not found")
-    return FileResponse(TASKS_FILE_PATH, media_type="text/html")
+async def serve_tasks_page(request: Request):
+    return serve_cached_file(request, "tasks.html", PAGES_CACHE_CONTROL)
 
 
 @router.get("/account")
-async def serve_account_page():
-    if not ACCOUNT_FILE_PATH.exists():
-        raise HTTPException(404, "account.html not found")
-    return FileResponse(ACCOUNT_FILE_PATH, media_type="text/html")
+async def serve_account_page(request: Request):
+    return serve_cached_file(request, "account.html", PAGES_CACHE_CONTROL)
 
 
 @router.get("/signup")
-async def serve_signup_page():
-    if not SIGNUP_FILE_PATH.exists():
-        raise HTTPException(404, "signup.html not found")
-    return FileResponse(SIGNUP_FILE_PATH, media_type="text/html")
+async def serve_signup_page(request: Request):
+    return serve_cached_file(request, "signup.html", PAGES_CACHE_CONTROL)
+
+
+@router.get("/assets/{asset_path:path}")
+async def serve_asset(request: Request, asset_path: str):
+    return serve_cached_file(request, asset_path, ASSETS_CACHE_CONTROL)
@@ -1,54 +1,445 @@
-from fastapi import APIRouter, HTTPException, Depends, Path, Body, Response
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Depends,
+    Path,
+    Body,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 from starlette import status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import Select, and_, delete, insert, or_, select, tuple_, update
+from typing import Any, List, Literal, Optional
+from itertools import groupby
+import base64
+import binascii
+import hashlib
+import json
+import os
 
-from ..models import Tasks
-from ..database import get_db
-from ..request_response_schemas import TaskCreate, TaskUpdate, TaskResponse
+from ..models import TaskSummaries, Tasks, Users
+from ..database import ReleaseSessionRoute, get_db, get_read_db, reads_from_replica
+from ..request_response_schemas import (
+    BulkItemError,
+    BulkTaskCreateResponse,
+    TaskBatchRequest,
+    TaskBatchResponse,
+    TaskBatchResult,
+    TaskCreate,
+    TaskSummaryResponse,
+    TaskUpdate,
+    TaskResponse,
+)
 from ..utils.auth import JwtUser, get_current_user
+from ..utils.http import etag_matches
+from ..utils.response_cache import CachedResponse, task_response_cache
+from ..utils.serialization import (
+    TASK_ROW_COLUMNS,
+    TaskRowResponse,
+    TaskRowsResponse,
+    task_rows,
+)
+from ..utils.task_search import build_task_search_query, search_terms
+from ..utils.task_summary import (
+    COUNTER_COLUMNS,
+    PRIORITIES,
+    flush_task_summary,
+    summary_delta,
+    track_summary_delta,
+)
 
 # Router
-router = APIRouter(prefix="/api", tags=["Tasks"])
+router = APIRouter(prefix="/api", tags=["Tasks"], route_class=ReleaseSessionRoute)
+
+# Pagination
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Bulk writes
+BULK_MAX_BATCH_SIZE = int(os.getenv("TASKS_BULK_MAX_BATCH_SIZE", "1000"))
+
+# Conditional GET: clients may keep task reads but must revalidate them
+TASKS_CACHE_CONTROL = "private, no-cache"
+
+# Search results are ranked, so their pages are offsets (in the same cursors),
+# up to SEARCH_MAX_OFFSET: deeper pages would rank and skip ever more rows
+SEARCH_CURSOR_SORT = "rank"
+SEARCH_MAX_QUERY_LENGTH = 200
+SEARCH_MAX_OFFSET = 10000
+
+# Cursor keys (ids, priorities, offsets) fit the INTEGER columns they are
+# compared with; larger ones would fail in the database rather than here
+CURSOR_KEY_MAX = 2**31 - 1
+
+# sort option -> (keyset columns, descending?); `id` always breaks ties. A NULL
+# priority sorts after every value (first when descending), as PostgreSQL's
+# indexes store it.
+TaskSort = Literal["id", "-id", "priority", "-priority"]
+TASK_SORTS = {
+    "id": ((Tasks.id,), False),
+    "-id": ((Tasks.id,), True),
+    "priority": ((Tasks.priority, Tasks.id), False),
+    "-priority": ((Tasks.priority, Tasks.id), True),
+}
+
+
+def _encode_cursor(sort: str, keys: list[int | None]) -> str:
+    raw = json.dumps({"sort": sort, "keys": keys}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _valid_cursor_key(key) -> bool:
+    # JSON true/false decode to bools, which are ints too
+    return type(key) is int and 0 <= key <= CURSOR_KEY_MAX
+
+
+def _decode_cursor(cursor: str, sort: str, key_count: int) -> list[int | None]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        keys = data["keys"]
+        if (
+            data["sort"] != sort
+            or len(keys) != key_count
+            or not all(key is None or _valid_cursor_key(key) for key in keys)
+            or keys[-1] is None  # the tie-breaking id (or offset)
+        ):
+            raise ValueError
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        )
+    return keys
+
+
+def build_task_list_query(
+    owner_id: int,
+    is_complete: Optional[bool] = None,
+    priority: Optional[int] = None,
+    sort: str = "id",
+    after: Optional[list[int | None]] = None,
+) -> Select:
+    """One page of an owner's tasks, in `sort` order, after the keyset `after`."""
+    columns, descending = TASK_SORTS[sort]
+    query = select(*TASK_ROW_COLUMNS).where(Tasks.owner_id == owner_id)
+    if is_complete is not None:
+        query = query.where(Tasks.is_complete == is_complete)
+    if priority is not None:
+        query = query.where(Tasks.priority == priority)
+    if after is not None:
+        query = query.where(_after_keyset(columns, after, descending))
+    return query.order_by(*(_keyset_order(c, descending) for c in columns))
+
+
+def _keyset_order(column, descending: bool):
+    order = column.desc() if descending else column.asc()
+    if not column.nullable:
+        return order
+    return order.nulls_first() if descending else order.nulls_last()
+
+
+def _after_keyset(columns: tuple, after: list[int | None], descending: bool):
+    """Rows past the keyset `after`. Row-value comparisons are NULL for NULL
+    priorities, so the NULL group (last ascending, first descending) is
+    matched explicitly."""
+    position, after_position = tuple_(*columns), tuple_(*after)
+    if len(columns) == 1:
+        return position < after_position if descending else position > after_position
+
+    leading, tie = columns
+    leading_key, tie_key = after
+    if leading_key is None:
+        within_nulls = and_(
+            leading.is_(None), tie < tie_key if descending else tie > tie_key
+        )
+        return or_(within_nulls, leading.is_not(None)) if descending else within_nulls
+    if descending:
+        return position < after_position
+    return or_(position > after_position, leading.is_(None))
+
+
+# Change versions / ETags
+async def bump_tasks_version(db_session: AsyncSession, owner_id: int) -> None:
+    """Marks the owner's tasks as changed; run it in the write's transaction."""
+    await db_session.execute(
+        update(Users)
+        .where(Users.id == owner_id)
+        .values(tasks_version=Users.tasks_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def get_tasks_etag(db_session: AsyncSession, owner_id: int, *parts) -> str | None:
+    """
+    Strong ETag for a read of the owner's tasks, derived from their change
+    version (a primary-key read on users, the tasks table is not touched) and
+    the parts that select the representation (task id, page parameters...).
+    """
+    version = (
+        await db_session.execute(
+            select(Users.tasks_version).where(Users.id == owner_id)
+        )
+    ).scalar_one_or_none()
+    if version is None:
+        return None
+
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=8).hexdigest()
+    return f'"{owner_id}-{version}-{digest}"'
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": TASKS_CACHE_CONTROL},
+    )
+
+
+# Set-based write helpers (caller commits)
+async def insert_tasks(
+    db_session: AsyncSession, owner_id: int, tasks: list[TaskCreate]
+) -> list[Tasks]:
+    rows = [{**task.model_dump(), "owner_id": owner_id} for task in tasks]
+    created = list(
+        (
+            await db_session.scalars(
+                insert(Tasks).returning(Tasks, sort_by_parameter_order=True), rows
+            )
+        ).all()
+    )
+    track_summary_delta(
+        db_session, summary_delta((t.priority, t.is_complete) for t in created)
+    )
+    return created
+
+
+async def update_owned_tasks(
+    db_session: AsyncSession, owner_id: int, task_ids: list[int], values: dict
+) -> dict[int, Tasks]:
+    owned = (Tasks.id.in_(task_ids), Tasks.owner_id == owner_id)
+    if not values:
+        query = select(Tasks).where(*owned)
+        return {task.id: task for task in (await db_session.scalars(query)).all()}
+
+    # Counted fields change: read (and lock) their old values for the summary
+    before = {}
+    if "priority" in values or "is_complete" in values:
+        before = {
+            row.id: (row.priority, row.is_complete)
+            for row in await db_session.execute(
+                select(Tasks.id, Tasks.priority, Tasks.is_complete)
+                .where(*owned)
+                .with_for_update()
+            )
+        }
+
+    query = update(Tasks).where(*owned).values(**values).returning(Tasks)
+    updated = {task.id: task for task in (await db_session.scalars(query)).all()}
+    if before:
+        delta = summary_delta((t.priority, t.is_complete) for t in updated.values())
+        delta.update(summary_delta((before[task_id] for task_id in updated), sign=-1))
+        track_summary_delta(db_session, delta)
+    return updated
+
+
+async def delete_owned_tasks(
+    db_session: AsyncSession, owner_id: int, task_ids: list[int]
+) -> set[int]:
+    query = (
+        delete(Tasks)
+        .where(Tasks.id.in_(task_ids), Tasks.owner_id == owner_id)
+        .returning(Tasks.id, Tasks.priority, Tasks.is_complete)
+    )
+    deleted = (await db_session.execute(query)).all()
+    track_summary_delta(
+        db_session, summary_delta(((t.priority, t.is_complete) for t in deleted), -1)
+    )
+    return {row.id for row in deleted}
 
 
 # Endpoints
 @router.get("/tasks", response_model=List[TaskResponse], status_code=status.HTTP_200_OK)
 async def get_all_tasks(
+    request: Request,
+    user: JwtUser = Depends(get_current_user),
+    db_session: AsyncSession = Depends(get_read_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    is_complete: Optional[bool] = Query(None),
+    priority: Optional[int] = Query(None, ge=1, le=5),
+    sort: TaskSort = Query("id"),
+):
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed"
+        )
+
+    parts = ("list", limit, cursor, is_complete, priority, sort)
+    cached, cache_key = await task_response_cache.get(user.user_id, *parts)
+    if reads_from_replica(request):
+        cache_key = None  # the replica may lag: only primary reads fill the cache
+    if cached is not None:
+        return cached.to_response(request)
+
+    headers = {}
+    etag = await get_tasks_etag(db_session, user.user_id, *parts)
+    if etag is not None:
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            return not_modified(etag)
+        headers["ETag"] = etag
+        headers["Cache-Control"] = TASKS_CACHE_CONTROL
+
+    query = build_task_list_query(
+        owner_id=user.user_id,
+        is_complete=is_complete,
+        priority=priority,
+        sort=sort,
+        after=(
+            _decode_cursor(cursor, sort, len(TASK_SORTS[sort][0]))
+            if cursor is not None
+            else None
+        ),
+    )
+
+    # Fetch one extra row to learn whether another page exists
+    tasks = task_rows(await db_session.execute(query.limit(limit + 1)))
+
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        columns, _ = TASK_SORTS[sort]
+        headers[NEXT_CURSOR_HEADER] = _encode_cursor(
+            sort, [tasks[-1][column.key] for column in columns]
+        )
+    # Rows come straight from our own table, so skip response_model validation
+    response = TaskRowsResponse(tasks, headers=headers)
+    await task_response_cache.set(cache_key, CachedResponse(response.body, headers))
+    return response
+
+
+@router.get(
+    "/tasks/summary",
+    response_model=TaskSummaryResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_task_summary(
     user: JwtUser = Depends(get_current_user),
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_read_db),
 ):
+    """Task counts (total, completed, by priority) from the owner's counters
+    row: one primary-key read, however many tasks there are."""
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed"
         )
 
-    tasks = (
-        db_session.execute(select(Tasks).where(Tasks.owner_id == user.user_id))
-        .scalars()
-        .all()
+    counters = (
+        await db_session.execute(
+            select(*(getattr(TaskSummaries, c) for c in COUNTER_COLUMNS)).where(
+                TaskSummaries.owner_id == user.user_id
+            )
+        )
+    ).one_or_none()
+    counts = counters._asdict() if counters else dict.fromkeys(COUNTER_COLUMNS, 0)
+    return TaskSummaryResponse(
+        total=counts["total"],
+        completed=counts["completed"],
+        by_priority={p: counts[f"priority_{p}"] for p in PRIORITIES},
     )
-    return tasks
+
+
+@router.get(
+    "/tasks/search", response_model=List[TaskResponse], status_code=status.HTTP_200_OK
+)
+async def search_tasks(
+    request: Request,
+    user: JwtUser = Depends(get_current_user),
+    db_session: AsyncSession = Depends(get_read_db),
+    q: str = Query(..., min_length=1, max_length=SEARCH_MAX_QUERY_LENGTH),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+):
+    """
+    The owner's tasks whose title or details contain every word of `q`, best
+    matches first, as an indexed full-text query. Pages follow X-Next-Cursor,
+    like GET /api/tasks, for the first SEARCH_MAX_OFFSET matches.
+    """
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed"
+        )
+
+    offset = 0
+    if cursor is not None:
+        [offset] = _decode_cursor(cursor, SEARCH_CURSOR_SORT, 1)
+        if offset > SEARCH_MAX_OFFSET:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+            )
+
+    headers = {}
+    etag = await get_tasks_etag(db_session, user.user_id, "search", q, limit, cursor)
+    if etag is not None:
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            return not_modified(etag)
+        headers["ETag"] = etag
+        headers["Cache-Control"] = TASKS_CACHE_CONTROL
+
+    terms = search_terms(q)
+    if not terms:
+        return TaskRowsResponse([], headers=headers)
+
+    query = build_task_search_query(db_session.bind.dialect.name, user.user_id, terms)
+    tasks = task_rows(await db_session.execute(query.offset(offset).limit(limit + 1)))
+
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        if offset + limit <= SEARCH_MAX_OFFSET:
+            headers[NEXT_CURSOR_HEADER] = _encode_cursor(
+                SEARCH_CURSOR_SORT, [offset + limit]
+            )
+    return TaskRowsResponse(tasks, headers=headers)
 
 
 @router.get(
     "/tasks/{task_id}", response_model=TaskResponse, status_code=status.HTTP_200_OK
 )
 async def get_task_by_id(
+    request: Request,
     user: JwtUser = Depends(get_current_user),
     task_id: int = Path(gt=0),
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_read_db),
 ):
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed"
         )
 
-    target_task = db_session.execute(
-        select(Tasks).where(Tasks.id == task_id, Tasks.owner_id == user.user_id)
-    ).scalar_one_or_none()
+    cached, cache_key = await task_response_cache.get(user.user_id, "task", task_id)
+    if reads_from_replica(request):
+        cache_key = None  # the replica may lag: only primary reads fill the cache
+    if cached is not None:
+        return cached.to_response(request)
+
+    headers = {}
+    etag = await get_tasks_etag(db_session, user.user_id, "task", task_id)
+    if etag is not None:
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            return not_modified(etag)
+        headers["ETag"] = etag
+        headers["Cache-Control"] = TASKS_CACHE_CONTROL
+
+    target_task = (
+        await db_session.execute(
+            select(*TASK_ROW_COLUMNS).where(
+                Tasks.id == task_id, Tasks.owner_id == user.user_id
+            )
+        )
+    ).one_or_none()
 
     if target_task is None:
         raise HTTPException(
@@ -56,7 +447,9 @@ async def get_task_by_id(
             detail=f"Task (#{task_id}) not found. It likely doesn't exist.",
         )
 
-    return target_task
+    response = TaskRowResponse(target_task._asdict(), headers=headers)
+    await task_response_cache.set(cache_key, CachedResponse(response.body, headers))
+    return response
 
 
 @router.post("/tasks", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
@@ -64,7 +457,7 @@ async def post_task(
     response: Response,
     user: JwtUser = Depends(get_current_user),
     request_body: TaskCreate = Body(...),
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db),
 ):
     if user is None:
         raise HTTPException(
@@ -76,17 +469,22 @@ async def post_task(
 
     try:
         db_session.add(new_task)
-        db_session.commit()
-        db_session.refresh(new_task)
+        track_summary_delta(
+            db_session, summary_delta([(new_task.priority, new_task.is_complete)])
+        )
+        await bump_tasks_version(db_session, user.user_id)
+        await flush_task_summary(db_session, user.user_id)
+        await db_session.commit()  # INSERT ... RETURNING already loaded the row
+        await task_response_cache.invalidate(user.user_id)
 
     except IntegrityError:
-        db_session.rollback()
+        await db_session.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail="Constraint violation."
         )
 
     except SQLAlchemyError:
-        db_session.rollback()
+        await db_session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error."
         )
@@ -95,6 +493,205 @@ async def post_task(
     return new_task
 
 
+@router.post(
+    "/tasks/bulk",
+    response_model=BulkTaskCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def post_tasks_bulk(
+    user: JwtUser = Depends(get_current_user),
+    request_body: List[Any] = Body(..., min_length=1),
+    db_session: AsyncSession = Depends(get_db),
+):
+    """
+    Creates up to TASKS_BULK_MAX_BATCH_SIZE tasks in one multi-row
+    INSERT ... RETURNING. Items are validated individually: valid ones are
+    created, invalid ones are reported by index in `errors`. Responds 422 if
+    no item was valid.
+    """
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed"
+        )
+
+    if len(request_body) > BULK_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BULK_MAX_BATCH_SIZE} tasks per request.",
+        )
+
+    valid_tasks: list[TaskCreate] = []
+    errors: list[BulkItemError] = []
+    for index, item in enumerate(request_body):
+        try:
+            valid_tasks.append(TaskCreate.model_validate(item))
+        except ValidationError as e:
+            errors.append(
+                BulkItemError(
+                    index=index,
+                    errors=e.errors(include_url=False, include_context=False),
+                )
+            )
+
+    if not valid_tasks:
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content=BulkTaskCreateResponse(created=[], errors=errors).model_dump(),
+        )
+
+    try:
+        created = await insert_tasks(db_session, user.user_id, valid_tasks)
+        await bump_tasks_version(db_session, user.user_id)
+        await flush_task_summary(db_session, user.user_id)
+        await db_session.commit()
+        await task_response_cache.invalidate(user.user_id)
+
+    except IntegrityError:
+        await db_session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Constraint violation."
+        )
+
+    except SQLAlchemyError:
+        await db_session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error."
+        )
+
+    return BulkTaskCreateResponse(
+        created=[TaskResponse.model_validate(t, from_attributes=True) for t in created],
+        errors=errors,
+    )
+
+
+@router.post(
+    "/tasks/batch", response_model=TaskBatchResponse, status_code=status.HTTP_200_OK
+)
+async def post_tasks_batch(
+    user: JwtUser = Depends(get_current_user),
+    request_body: TaskBatchRequest = Body(...),
+    db_session: AsyncSession = Depends(get_db),
+):
+    """
+    Applies an ordered list of create/update/delete/complete operations in one
+    transaction. Each run of consecutive operations of the same kind becomes a
+    single statement (multi-row INSERT, or UPDATE/DELETE ... WHERE id IN (...));
+    updates run one UPDATE ... RETURNING each, as their values differ.
+
+    An operation on a task that doesn't exist (or isn't yours) gets a 404
+    result without aborting the batch; a database error rolls back all of it.
+    """
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed"
+        )
+
+    operations = request_body.operations
+    if len(operations) > BULK_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BULK_MAX_BATCH_SIZE} operations per request.",
+        )
+
+    def result(index: int, op: str, task_id: int | None, task: Tasks | None = None):
+        return TaskBatchResult(
+            index=index,
+            op=op,
+            status=status.HTTP_201_CREATED if op == "create" else status.HTTP_200_OK,
+            id=task_id,
+            task=(
+                TaskResponse.model_validate(task, from_attributes=True)
+                if task
+                else None
+            ),
+        )
+
+    def not_found(index: int, op: str, task_id: int):
+        return TaskBatchResult(
+            index=index, op=op, status=status.HTTP_404_NOT_FOUND, id=task_id
+        )
+
+    results: list[TaskBatchResult] = []
+    unchanged: set[int] = set()  # indexes of updates with no changes
+    try:
+        for op, group in groupby(enumerate(operations), key=lambda item: item[1].op):
+            run = list(group)
+
+            if op == "create":
+                created = await insert_tasks(
+                    db_session, user.user_id, [operation.task for _, operation in run]
+                )
+                for (index, _), task in zip(run, created):
+                    results.append(result(index, op, task.id, task))
+
+            elif op == "update":
+                for index, operation in run:
+                    values = operation.changes.model_dump(exclude_unset=True)
+                    if not values:
+                        unchanged.add(index)
+                    task = (
+                        await update_owned_tasks(
+                            db_session, user.user_id, [operation.id], values
+                        )
+                    ).get(operation.id)
+                    results.append(
+                        result(index, op, operation.id, task)
+                        if task
+                        else not_found(index, op, operation.id)
+                    )
+
+            elif op == "complete":
+                completed = await update_owned_tasks(
+                    db_session,
+                    user.user_id,
+                    [operation.id for _, operation in run],
+                    {"is_complete": True},
+                )
+                for index, operation in run:
+                    task = completed.get(operation.id)
+                    results.append(
+                        result(index, op, operation.id, task)
+                        if task
+                        else not_found(index, op, operation.id)
+                    )
+
+            elif op == "delete":
+                deleted = await delete_owned_tasks(
+                    db_session, user.user_id, [operation.id for _, operation in run]
+                )
+                for index, operation in run:
+                    if operation.id in deleted:
+                        deleted.discard(operation.id)  # a repeated id is a 404
+                        results.append(result(index, op, operation.id))
+                    else:
+                        results.append(not_found(index, op, operation.id))
+
+        changed = any(
+            r.status != status.HTTP_404_NOT_FOUND and r.index not in unchanged
+            for r in results
+        )
+        if changed:
+            await bump_tasks_version(db_session, user.user_id)
+            await flush_task_summary(db_session, user.user_id)
+        await db_session.commit()
+        if changed:
+            await task_response_cache.invalidate(user.user_id)
+
+    except IntegrityError:
+        await db_session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Constraint violation."
+        )
+
+    except SQLAlchemyError:
+        await db_session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error."
+        )
+
+    return TaskBatchResponse(results=results)
+
+
 @router.put(
     "/tasks/{task_id}",
     response_model=TaskResponse,
@@ -104,41 +701,45 @@ async def update_task(
     user: JwtUser = Depends(get_current_user),
     task_id: int = Path(gt=0),
     updated_task: TaskUpdate = Body(...),
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db),
 ):
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed"
         )
 
-    db_task = db_session.get(Tasks, task_id)
-
-    if not db_task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task (#{task_id}) not found.",
-        )
-    else:
-        for field, value in updated_task.model_dump(exclude_unset=True).items():
-            setattr(db_task, field, value)
-
+    # UPDATE ... WHERE id = ? AND owner_id = ? RETURNING *, touching only the
+    # fields the client sent
+    values = updated_task.model_dump(exclude_unset=True)
     try:
-        db_session.add(db_task)
-        db_session.commit()
-        db_session.refresh(db_task)
+        db_task = (
+            await update_owned_tasks(db_session, user.user_id, [task_id], values)
+        ).get(task_id)
+        # An empty body changes nothing: the ETag and cached reads still hold
+        if db_task is not None and values:
+            await bump_tasks_version(db_session, user.user_id)
+            await flush_task_summary(db_session, user.user_id)
+            await db_session.commit()
+            await task_response_cache.invalidate(user.user_id)
 
     except IntegrityError:
-        db_session.rollback()
+        await db_session.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail="Constraint violation."
         )
 
     except SQLAlchemyError:
-        db_session.rollback()
+        await db_session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error."
         )
 
+    if db_task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task (#{task_id}) not found.",
+        )
+
     return db_task
 
 
@@ -146,34 +747,38 @@ async def update_task(
 async def delete_task(
     user: JwtUser = Depends(get_current_user),
     task_id: int = Path(gt=0),
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db),
 ):
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed"
         )
 
-    db_task = db_session.get(Tasks, task_id)
-    if not db_task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task (#{task_id}) not found.",
-        )
-
+    # DELETE ... WHERE id = ? AND owner_id = ? RETURNING id
     try:
-        db_session.delete(db_task)
-        db_session.commit()
+        deleted = await delete_owned_tasks(db_session, user.user_id, [task_id])
+        if deleted:
+            await bump_tasks_version(db_session, user.user_id)
+            await flush_task_summary(db_session, user.user_id)
+            await db_session.commit()
+            await task_response_cache.invalidate(user.user_id)
     except IntegrityError:
-        db_session.rollback()
+        await db_session.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail="Constraint violation."
         )
 
     except SQLAlchemyError:
-        db_session.rollback()
+        await db_session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database error.",
         )
 
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task (#{task_id}) not found.",
+        )
+
     return {"message": f"Task #{task_id} was successfully deleted."}
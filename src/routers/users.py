@@ -1,11 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends, Body
+from fastapi import APIRouter, HTTPException, Depends, Body, Request
+from fastapi.responses import JSONResponse
 from starlette import status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy import select
 
 from ..models import Users
-from ..database import get_db
+from ..database import ReleaseSessionRoute, get_db, get_read_db, reads_from_replica
 from ..request_response_schemas import (
     PhoneChange,
     UserVerification,
@@ -13,24 +14,29 @@ from ..request_response_schemas import (
     UserResponse,
 )
 from ..utils.auth import JwtUser, get_current_user
-from ..utils.security import hash_password, verify_password
+from ..utils.rate_limit import check_credential_rate_limits
+from ..utils.response_cache import CachedResponse, user_response_cache
+from ..utils.security import password_hasher
 
 # Initialize Router
-router = APIRouter(prefix="/api", tags=["Users"])
+router = APIRouter(prefix="/api", tags=["Users"], route_class=ReleaseSessionRoute)
 
 
 @router.post("/users", status_code=status.HTTP_201_CREATED)
 async def create_user(
+    request: Request,
     create_user_request: CreateUser = Body(...),
     response_model=UserResponse,
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db),
 ):
+    await check_credential_rate_limits(request, create_user_request.username)
+    hashed_password = await password_hasher.hash(create_user_request.password)
     new_user = Users(
         username=create_user_request.username.strip(),
         email=create_user_request.email.strip(),
         first_name=create_user_request.first_name.capitalize(),
         last_name=create_user_request.last_name.capitalize(),
-        hashed_password=hash_password(create_user_request.password),
+        hashed_password=hashed_password,
         phone_number=create_user_request.phone_number,
         role=create_user_request.role,
         is_active=True,
@@ -38,8 +44,9 @@ async def create_user(
 
     try:
         db_session.add(new_user)
-        db_session.commit()
-        db_session.refresh(new_user)
+        await db_session.commit()
+        await db_session.refresh(new_user)
+        await user_response_cache.invalidate(new_user.id)
         return {
             "username": new_user.username,
             "email": new_user.email,
@@ -51,14 +58,14 @@ async def create_user(
         }
 
     except IntegrityError:
-        db_session.rollback()
+        await db_session.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="This account likely already exists.",
         )
 
     except SQLAlchemyError:
-        db_session.rollback()
+        await db_session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error."
         )
@@ -66,29 +73,40 @@ async def create_user(
 
 @router.get("/users", status_code=status.HTTP_200_OK)
 async def get_user(
+    request: Request,
     user: JwtUser = Depends(get_current_user),
     response_model=UserResponse,
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_read_db),
 ):
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed"
         )
 
-    target_user: Users = db_session.execute(
-        select(Users).where(Users.id == user.user_id)
+    cached, cache_key = await user_response_cache.get(user.user_id)
+    if reads_from_replica(request):
+        cache_key = None  # the replica may lag: only primary reads fill the cache
+    if cached is not None:
+        return cached.to_response(request)
+
+    target_user: Users = (
+        await db_session.execute(select(Users).where(Users.id == user.user_id))
     ).scalar_one_or_none()
 
     if target_user:
-        return {
-            "username": target_user.username,
-            "email": target_user.email,
-            "first_name": target_user.first_name,
-            "last_name": target_user.last_name,
-            "hashed_password": target_user.hashed_password,
-            "role": target_user.role,
-            "phone_number": target_user.phone_number,
-        }
+        response = JSONResponse(
+            {
+                "username": target_user.username,
+                "email": target_user.email,
+                "first_name": target_user.first_name,
+                "last_name": target_user.last_name,
+                "hashed_password": target_user.hashed_password,
+                "role": target_user.role,
+                "phone_number": target_user.phone_number,
+            }
+        )
+        await user_response_cache.set(cache_key, CachedResponse(response.body, {}))
+        return response
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -100,18 +118,18 @@ async def get_user(
 async def change_password(
     user_verification: UserVerification,
     user: JwtUser = Depends(get_current_user),
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db),
 ):
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication failed."
         )
 
-    db_user = db_session.execute(
-        select(Users).where(Users.id == user.user_id)
+    db_user = (
+        await db_session.execute(select(Users).where(Users.id == user.user_id))
     ).scalar_one_or_none()
 
-    if not verify_password(
+    if not await password_hasher.verify(
         submitted_password=user_verification.password,
         password_hash=db_user.hashed_password,  # type: ignore
     ):
@@ -119,20 +137,23 @@ async def change_password(
             status_code=status.HTTP_403_FORBIDDEN, detail="Incorrect password."
         )
     else:
-        db_user.hashed_password = hash_password(user_verification.new_password)  # type: ignore
+        db_user.hashed_password = await password_hasher.hash(  # type: ignore
+            user_verification.new_password
+        )
         try:
             db_session.add(db_user)
-            db_session.commit()
-            db_session.refresh(db_user)
+            await db_session.commit()
+            await db_session.refresh(db_user)
+            await user_response_cache.invalidate(user.user_id)
 
         except IntegrityError:
-            db_session.rollback()
+            await db_session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT, detail="Constraint violation."
             )
 
         except SQLAlchemyError:
-            db_session.rollback()
+            await db_session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Database error.",
@@ -143,18 +164,18 @@ async def change_password(
 async def change_phone_number(
     phone_change: PhoneChange,
     user: JwtUser = Depends(get_current_user),
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db),
 ):
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication failed."
         )
 
-    db_user = db_session.execute(
-        select(Users).where(Users.id == user.user_id)
+    db_user = (
+        await db_session.execute(select(Users).where(Users.id == user.user_id))
     ).scalar_one_or_none()
 
-    if not verify_password(
+    if not await password_hasher.verify(
         submitted_password=phone_change.password,
         password_hash=db_user.hashed_password,  # type: ignore
     ):
@@ -165,17 +186,18 @@ async def change_phone_number(
         db_user.phone_number = phone_change.new_phone_number  # type: ignore
         try:
             db_session.add(db_user)
-            db_session.commit()
-            db_session.refresh(db_user)
+            await db_session.commit()
+            await db_session.refresh(db_user)
+            await user_response_cache.invalidate(user.user_id)
 
         except IntegrityError:
-            db_session.rollback()
+            await db_session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT, detail="Constraint violation."
             )
 
         except SQLAlchemyError:
-            db_session.rollback()
+            await db_session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Database error.",
@@ -1,8 +1,12 @@
 import pytest
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
 from ..database import Base
-from sqlalchemy.pool import StaticPool
+from ..utils.rate_limit import ip_rate_limiter, username_rate_limiter
+from ..utils.response_cache import task_response_cache, user_response_cache
+from sqlalchemy.pool import StaticPool, NullPool
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 # Test Database Setup (SQLITE)
 SQLITE_DB_URL = "sqlite:///./test_listo.db"
@@ -11,9 +15,63 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async session for the app under test (same SQLITE file as the fixtures)
+ASYNC_SQLITE_DB_URL = "sqlite+aiosqlite:///./test_listo.db"
+async_engine = create_async_engine(ASYNC_SQLITE_DB_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_db():
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)  # optional
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Every test starts with full login/sign-up buckets."""
+    for limiter in (ip_rate_limiter, username_rate_limiter):
+        limiter.store.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_response_caches():
+    """Tests write to the database directly (and reuse ids): start uncached."""
+    for cache in (task_response_cache, user_response_cache):
+        cache.clear()
+    yield
+
+
+@pytest.fixture
+def response_caches_enabled(monkeypatch):
+    """The task/user read caches, which are off by default, on for the test."""
+    for cache in (task_response_cache, user_response_cache):
+        monkeypatch.setattr(cache, "ttl_seconds", 30)
+    yield
+
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """
+    Fails if the app's (async) engine executes more than `max_queries`
+    statements inside the block (e.g. around one client call), so N+1
+    regressions fail CI. A batched insert counts once, however the dialect
+    splits it into round trips.
+    """
+    statements: list[str] = []
+
+    def record(conn, clauseelement, multiparams, params, execution_options):
+        statements.append(str(clauseelement))
+
+    event.listen(async_engine.sync_engine, "before_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_execute", record)
+    assert (
+        len(statements) <= max_queries
+    ), f"{len(statements)} queries (max {max_queries}):\n" + "\n".join(statements)
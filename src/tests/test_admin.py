@@ -1,23 +1,25 @@
+import json
 import pytest
 
 from fastapi.testclient import TestClient
 from starlette import status
 from sqlalchemy import text
 
-from ..database import get_db
-from ..models import Tasks
+from ..database import get_db, get_sessionmaker
+from ..models import TaskSummaries, Tasks
 from ..utils.auth import JwtUser, get_current_user
-from .conftest import TestingSessionLocal, engine
+from .conftest import TestingSessionLocal, TestingAsyncSessionLocal, engine
 
 
 # Dependency Overrides
-def override_get_db_test_admin():
+async def override_get_db_test_admin():
     """Creates a database session to your local db."""
-    db_test_session = TestingSessionLocal()
-    try:
+    async with TestingAsyncSessionLocal() as db_test_session:
         yield db_test_session
-    finally:
-        db_test_session.close()
+
+
+def override_get_sessionmaker_test_admin():
+    return TestingAsyncSessionLocal
 
 
 def override_get_current_user_test_admin():
@@ -30,6 +32,7 @@ def client():
     from ..main import app
 
     app.dependency_overrides[get_db] = override_get_db_test_admin
+    app.dependency_overrides[get_sessionmaker] = override_get_sessionmaker_test_admin
     app.dependency_overrides[get_current_user] = override_get_current_user_test_admin
     with TestClient(app) as c:
         yield c
@@ -66,6 +69,7 @@ def clean_db():
     yield
     with engine.begin() as conn:
         conn.execute(text("DELETE FROM tasks;"))
+        conn.execute(text("DELETE FROM task_summaries;"))
 
 
 # Tests
@@ -100,3 +104,102 @@ def test_admin_get_all_tasks_sc_401(
 
     response = client.get("/api/admin/tasks")
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_admin_export_all_tasks_sc_200(
+    client: TestClient, test_tasks: list[Tasks], clean_db
+):
+    response = client.get("/api/admin/tasks/export")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert exported == [
+        {
+            "title": test_task.title,
+            "details": test_task.details,
+            "priority": test_task.priority,
+            "is_complete": test_task.is_complete,
+            "id": test_task.id,
+            "owner_id": test_task.owner_id,
+        }
+        for test_task in test_tasks
+    ]
+
+
+def test_admin_export_all_tasks_filters(
+    client: TestClient, test_tasks: list[Tasks], clean_db
+):
+    response = client.get("/api/admin/tasks/export", params={"owner_id": 2})
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [task["id"] for task in exported] == [test_tasks[1].id]
+
+    response = client.get(
+        "/api/admin/tasks/export", params={"after_id": test_tasks[1].id}
+    )
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [task["id"] for task in exported] == [t.id for t in test_tasks[2:]]
+
+
+def test_admin_export_all_tasks_streams_compressed(
+    client: TestClient, test_tasks: list[Tasks], clean_db
+):
+    response = client.get(
+        "/api/admin/tasks/export", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [task["id"] for task in exported] == [t.id for t in test_tasks]
+
+
+def test_admin_export_all_tasks_sc_401(
+    client: TestClient, test_tasks: list[Tasks], clean_db
+):
+    from ..main import app
+
+    def override_get_current_user_test_admin():
+        return JwtUser(user_id=1, username="test_user", role="user")
+
+    app.dependency_overrides[get_current_user] = override_get_current_user_test_admin
+
+    response = client.get("/api/admin/tasks/export")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_admin_repair_task_summaries(
+    client: TestClient, test_tasks: list[Tasks], clean_db
+):
+    # the fixture's tasks were inserted behind the counters' back
+    db = TestingSessionLocal()
+    db.add(TaskSummaries(owner_id=1, total=7, completed=7))
+    db.add(TaskSummaries(owner_id=99, total=1))  # no tasks left at all
+    db.commit()
+
+    response = client.post("/api/admin/tasks/summaries/repair", params={"owner_id": 1})
+    assert response.json() == {"owners": 1}
+    db.expire_all()
+    assert db.get(TaskSummaries, 1).total == 1
+    assert db.get(TaskSummaries, 99) is not None  # other owners untouched
+
+    response = client.post("/api/admin/tasks/summaries/repair")
+    assert response.json() == {"owners": 4}
+    db.expire_all()
+    summaries = {row.owner_id: row for row in db.query(TaskSummaries).all()}
+    db.close()
+    assert sorted(summaries) == [1, 2, 3, 4]
+    assert all(
+        (row.total, row.completed, row.priority_1) == (1, 0, 1)
+        for row in summaries.values()
+    )
+
+
+def test_admin_get_runtime_stats_sc_200(client: TestClient):
+    response = client.get("/api/admin/stats")
+    assert response.status_code == status.HTTP_200_OK
+
+    hashing_stats = response.json()["password_hashing"]
+    assert hashing_stats["in_flight"] == 0
+    assert hashing_stats["queue_depth"] == 0
+    assert "avg_wait_ms" in hashing_stats
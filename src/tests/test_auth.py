@@ -4,12 +4,20 @@ from fastapi.testclient import TestClient
 from fastapi import Response
 from starlette import status
 from datetime import timedelta
+from jose import jwt
+import time
 
 from ..database import get_db
 from ..models import Users
-from ..utils.security import hash_password
-from ..utils.auth import create_refresh_token
-from .conftest import TestingSessionLocal, engine
+from ..utils.rate_limit import username_rate_limiter
+from ..utils.security import hash_password, password_hasher
+from ..utils.auth import (
+    create_access_token,
+    create_refresh_token,
+    token_claims_cache,
+    user_state_cache,
+)
+from .conftest import TestingSessionLocal, TestingAsyncSessionLocal, engine
 
 
 # Dummy Data
@@ -27,13 +35,10 @@ test_user_phone_numbers = [
 
 
 # Dependency Overrides
-def override_get_db_test_auth():
+async def override_get_db_test_auth():
     """Creates a database session to your local db."""
-    db_test_session = TestingSessionLocal()
-    try:
+    async with TestingAsyncSessionLocal() as db_test_session:
         yield db_test_session
-    finally:
-        db_test_session.close()
 
 
 # Fixtures
@@ -41,6 +46,7 @@ def override_get_db_test_auth():
 def client():
     from ..main import app
 
+    app.dependency_overrides.clear()  # use the real get_current_user
     app.dependency_overrides[get_db] = override_get_db_test_auth
     with TestClient(app) as c:
         yield c
@@ -181,3 +187,113 @@ def test_auth_get_refresh_token_sc_401_expired_refresh_token(
     response = client.post("/api/refresh", cookies={"refresh_token": expired_token})
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_auth_get_current_user_served_from_cache(
+    client: TestClient, dummy_users: list[Users], clean_db_auth
+):
+    user_state_cache.clear()
+    user = dummy_users[0]
+    access_token = create_access_token(
+        username=user.username, user_id=user.id, role=user.role  # type: ignore
+    )
+    client.cookies.set("access_token", access_token)
+
+    misses_before = user_state_cache.misses
+    hits_before = user_state_cache.hits
+    for _ in range(3):
+        response = client.get("/api/users")
+        assert response.status_code == status.HTTP_200_OK
+
+    # First request loads the user state, the rest are pure cache hits
+    assert user_state_cache.misses == misses_before + 1
+    assert user_state_cache.hits == hits_before + 2
+
+
+def test_auth_get_current_user_sc_401_after_deactivation(
+    client: TestClient, dummy_users: list[Users], clean_db_auth
+):
+    user_state_cache.clear()
+    user = dummy_users[0]
+    access_token = create_access_token(
+        username=user.username, user_id=user.id, role=user.role  # type: ignore
+    )
+    client.cookies.set("access_token", access_token)
+    assert client.get("/api/users").status_code == status.HTTP_200_OK
+
+    # Deactivating through the ORM invalidates the cached state on commit
+    db_session = TestingSessionLocal()
+    db_user = db_session.get(Users, user.id)
+    db_user.is_active = False  # type: ignore
+    db_session.commit()
+    db_session.close()
+
+    response = client.get("/api/users")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_auth_get_current_user_verifies_token_once(
+    client: TestClient, dummy_users: list[Users], clean_db_auth, monkeypatch
+):
+    user_state_cache.clear()
+    token_claims_cache.clear()
+    user = dummy_users[0]
+    access_token = create_access_token(
+        username=user.username, user_id=user.id, role=user.role  # type: ignore
+    )
+    client.cookies.set("access_token", access_token)
+
+    decode_calls = []
+    real_decode = jwt.decode
+    monkeypatch.setattr(
+        jwt, "decode", lambda *a, **kw: decode_calls.append(1) or real_decode(*a, **kw)
+    )
+    for _ in range(3):
+        assert client.get("/api/users").status_code == status.HTTP_200_OK
+
+    assert len(decode_calls) == 1
+    assert len(token_claims_cache) == 1
+    # cached until the token expires, not for a fixed TTL
+    (expires_at, claims), *_ = token_claims_cache._entries.values()
+    assert abs(expires_at - time.monotonic() - (claims["exp"] - time.time())) < 5
+
+
+def test_auth_get_current_user_sc_401_tampered_token_not_cached(
+    client: TestClient, dummy_users: list[Users], clean_db_auth
+):
+    token_claims_cache.clear()
+    user = dummy_users[0]
+    access_token = create_access_token(
+        username=user.username, user_id=user.id, role=user.role  # type: ignore
+    )
+    client.cookies.set("access_token", access_token[:-2] + "xx")
+
+    response = client.get("/api/users")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert len(token_claims_cache) == 0
+
+
+def test_auth_login_sc_429_before_hashing(
+    client: TestClient, dummy_users: list[Users], clean_db_auth, monkeypatch
+):
+    monkeypatch.setattr(username_rate_limiter, "burst", 2)
+    auth_data = {"username": dummy_users[0].username, "password": "wrong_password"}
+    for _ in range(2):
+        response = client.post("/api/token", data=auth_data)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    hashed_before = password_hasher.completed
+    rejected_before = username_rate_limiter.rejected
+    # same username, other case and padding: still the same bucket
+    auth_data["username"] = f" {dummy_users[0].username.upper()} "
+    response = client.post("/api/token", data=auth_data)
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["retry-after"]) >= 1
+    assert password_hasher.completed == hashed_before
+    assert username_rate_limiter.rejected == rejected_before + 1
+
+    # other usernames are only limited by address
+    other_user = {"username": dummy_users[1].username, "password": "wrong_password"}
+    response = client.post("/api/token", data=other_user)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
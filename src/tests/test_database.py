@@ -0,0 +1,240 @@
+import asyncio
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, field_validator
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import time
+
+from .. import database
+from ..database import (
+    PRIMARY_READS_COOKIE,
+    ReadYourWritesMiddleware,
+    ReleaseSessionRoute,
+    TimedAsyncQueuePool,
+    TimedNullPool,
+    build_engine_kwargs,
+    get_db,
+    get_read_db,
+)
+from ..utils.request_stats import RequestStats, current_request_stats
+from .conftest import ASYNC_SQLITE_DB_URL, TestingAsyncSessionLocal, async_engine
+
+
+# Helpers
+async def prewarm_and_check(monkeypatch):
+    test_engine = create_async_engine(
+        ASYNC_SQLITE_DB_URL, poolclass=TimedAsyncQueuePool, pool_size=3
+    )
+    monkeypatch.setattr(database, "engine", test_engine)
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 3)
+    try:
+        assert await database.prewarm_pool(5) == 3  # capped at the pool size
+        stats = database.pool_stats()
+        assert stats["pool"] == "TimedAsyncQueuePool"
+        assert stats["checked_in"] == 3
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 3
+
+        async with test_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        assert database.pool_stats()["checkouts"] == 4
+    finally:
+        await test_engine.dispose()
+
+
+def replica_routing_app() -> FastAPI:
+    """App whose /which endpoint reports which database it read from."""
+    app = FastAPI()
+
+    @app.get("/which")
+    async def which(db_session: AsyncSession = Depends(get_read_db)):
+        return {"replica": db_session.info.get("replica", False)}
+
+    @app.post("/write")
+    async def write():
+        return {}
+
+    @app.post("/fail", status_code=400)
+    async def fail():
+        return {}
+
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as db_session:
+            yield db_session
+
+    app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=5)
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+# Tests
+def test_database_engine_kwargs_from_env(monkeypatch):
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 12)
+    monkeypatch.setattr(database, "DB_MAX_OVERFLOW", 3)
+    monkeypatch.setattr(database, "DB_POOL_PRE_PING", False)
+
+    kwargs = build_engine_kwargs()
+    assert kwargs["poolclass"] is TimedAsyncQueuePool
+    assert kwargs["pool_size"] == 12
+    assert kwargs["max_overflow"] == 3
+    assert kwargs["pool_pre_ping"] is False
+
+
+def test_database_engine_kwargs_pre_ping_by_default():
+    # DB_POOL_PRE_PING is not set for the tests
+    assert build_engine_kwargs()["pool_pre_ping"] is True
+
+
+def test_database_engine_kwargs_pgbouncer(monkeypatch):
+    monkeypatch.setattr(database, "DB_PGBOUNCER", True)
+
+    kwargs = build_engine_kwargs()
+    assert kwargs["poolclass"] is TimedNullPool
+    assert "pool_size" not in kwargs
+    assert "pool_pre_ping" not in kwargs
+    assert kwargs["connect_args"]["statement_cache_size"] == 0
+    assert kwargs["connect_args"]["prepared_statement_cache_size"] == 0
+    name_func = kwargs["connect_args"]["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+
+def test_database_prewarm_pool_and_wait_stats(monkeypatch):
+    asyncio.run(prewarm_and_check(monkeypatch))
+
+
+def test_database_release_session_route_closes_before_serialization():
+    sessions: list[AsyncSession] = []
+    in_transaction_while_serializing: list[bool] = []
+
+    class Answer(BaseModel):
+        value: int
+
+        @field_validator("value")
+        def record_session_state(cls, value: int):
+            in_transaction_while_serializing.append(sessions[0].in_transaction())
+            return value
+
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as db_session:
+            sessions.append(db_session)
+            yield db_session
+
+    router = APIRouter(route_class=ReleaseSessionRoute)
+
+    @router.get("/answer", response_model=Answer)
+    async def answer(db_session: AsyncSession = Depends(get_db)):
+        value = (await db_session.execute(text("SELECT 42"))).scalar_one()
+        assert db_session.in_transaction()
+        return {"value": value}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        response = client.get("/answer")
+
+    assert response.json() == {"value": 42}
+    assert in_transaction_while_serializing == [False]
+
+
+def test_database_release_session_route_closes_dependency_sessions(monkeypatch):
+    """A dependency's own primary session (like get_current_user's) is released
+    too, when the endpoint reads from the replica."""
+    replica_sessions = async_sessionmaker(bind=async_engine, info={"replica": True})
+    monkeypatch.setattr(database, "ReplicaSessionLocal", replica_sessions)
+    sessions: list[AsyncSession] = []
+    in_transaction_while_serializing: list[bool] = []
+
+    class Answer(BaseModel):
+        value: int
+
+        @field_validator("value")
+        def record_session_state(cls, value: int):
+            in_transaction_while_serializing.extend(
+                db_session.in_transaction() for db_session in sessions
+            )
+            return value
+
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as db_session:
+            yield db_session
+
+    async def current_user(db_session: AsyncSession = Depends(get_db)):
+        sessions.append(db_session)
+        return (await db_session.execute(text("SELECT 1"))).scalar_one()
+
+    router = APIRouter(route_class=ReleaseSessionRoute)
+
+    @router.get("/answer", response_model=Answer)
+    async def answer(
+        user: int = Depends(current_user),
+        db_session: AsyncSession = Depends(get_read_db),
+    ):
+        sessions.append(db_session)
+        value = (await db_session.execute(text("SELECT 42"))).scalar_one()
+        assert db_session.info["replica"] and db_session is not sessions[0]
+        return {"value": value}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        response = client.get("/answer")
+
+    assert response.json() == {"value": 42}
+    assert in_transaction_while_serializing == [False, False]
+
+
+def test_database_failed_statements_counted_and_not_left_on_connection():
+    test_engine = create_engine("sqlite://")
+    stats = RequestStats()
+    token = current_request_stats.set(stats)
+    try:
+        with test_engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.execute(text("SELECT * FROM no_such_table"))
+            assert "query_started_at" not in conn.info
+            conn.execute(text("SELECT 1"))
+            assert "query_started_at" not in conn.info
+    finally:
+        current_request_stats.reset(token)
+        test_engine.dispose()
+
+    assert stats.queries == 4
+
+
+def test_database_read_db_without_replica_uses_primary(monkeypatch):
+    monkeypatch.setattr(database, "ReplicaSessionLocal", None)
+    with TestClient(replica_routing_app()) as client:
+        assert client.get("/which").json() == {"replica": False}
+
+
+def test_database_read_db_routes_to_replica_except_after_writes(monkeypatch):
+    replica_sessions = async_sessionmaker(bind=async_engine, info={"replica": True})
+    monkeypatch.setattr(database, "ReplicaSessionLocal", replica_sessions)
+
+    with TestClient(replica_routing_app()) as client:
+        assert client.get("/which").json() == {"replica": True}
+
+        # Successful writes pin the client's reads to the primary for a while
+        response = client.post("/write")
+        until = float(response.cookies[PRIMARY_READS_COOKIE])
+        assert time.time() < until <= time.time() + 5
+        assert "Max-Age=5" in response.headers["set-cookie"]
+        client.cookies.set(PRIMARY_READS_COOKIE, str(until))
+        assert client.get("/which").json() == {"replica": False}
+
+        # ...until the window is over
+        client.cookies.set(PRIMARY_READS_COOKIE, str(time.time() - 1))
+        assert client.get("/which").json() == {"replica": True}
+        client.cookies.set(PRIMARY_READS_COOKIE, "not-a-time")
+        assert client.get("/which").json() == {"replica": True}
+
+        # Reads and failed writes do not
+        client.cookies.clear()
+        assert "set-cookie" not in client.get("/which").headers
+        assert "set-cookie" not in client.post("/fail").headers
@@ -0,0 +1,121 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette import status
+
+from ..database import get_db
+from ..utils.auth import JwtUser, get_current_user
+from ..utils import metrics
+from ..utils.metrics import Histogram
+from .conftest import TestingAsyncSessionLocal
+
+
+# Dependency Overrides
+async def override_get_db_test_metrics():
+    """Creates a database session to your local db."""
+    async with TestingAsyncSessionLocal() as db_test_session:
+        yield db_test_session
+
+
+def override_get_current_user_test_metrics():
+    return JwtUser(user_id=1, username="test_user", role="user")
+
+
+# Pytest Fixtures
+@pytest.fixture
+def client(monkeypatch):
+    from ..main import app
+
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "scrape-token")
+    app.dependency_overrides[get_db] = override_get_db_test_metrics
+    app.dependency_overrides[get_current_user] = override_get_current_user_test_metrics
+    with TestClient(app) as c:
+        yield c
+
+
+# Helpers
+def scrape(client: TestClient) -> dict[str, float]:
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = float(value)
+    return samples
+
+
+# Tests
+def test_metrics_requests_labelled_by_route_template(client: TestClient):
+    before = scrape(client)
+    for task_id in (123456, 654321):
+        client.get(f"/api/tasks/{task_id}")
+    client.get("/definitely/not/a/route")
+    after = scrape(client)
+
+    series = (
+        "listo_http_requests_total"
+        '{method="GET",route="/api/tasks/{task_id}",status="404"}'
+    )
+    assert after[series] - before.get(series, 0) == 2
+    assert not any("123456" in name for name in after)
+
+    unmatched = (
+        'listo_http_requests_total{method="GET",route="<unmatched>",status="404"}'
+    )
+    assert after[unmatched] - before.get(unmatched, 0) == 1
+
+    count = (
+        "listo_http_request_duration_seconds_count"
+        '{method="GET",route="/api/tasks/{task_id}"}'
+    )
+    inf_bucket = (
+        "listo_http_request_duration_seconds_bucket"
+        '{method="GET",route="/api/tasks/{task_id}",le="+Inf"}'
+    )
+    assert after[count] == after[inf_bucket] >= 2
+    # only the scrape itself is in flight
+    assert after["listo_http_requests_in_flight"] == 1
+
+
+def test_metrics_component_stats(client: TestClient):
+    samples = scrape(client)
+    for name in (
+        "listo_db_pool_checked_out",
+        "listo_db_pool_overflow",
+        "listo_db_pool_wait_seconds_total",
+        "listo_password_hashing_queue_depth",
+        "listo_password_hashing_hash_seconds_total",
+        "listo_password_hashing_completed_total",
+        "listo_user_cache_hits_total",
+    ):
+        assert name in samples
+
+
+@pytest.mark.parametrize(
+    "authorization", [None, "Bearer wrong-token", "Basic scrape-token"]
+)
+def test_metrics_scrape_requires_token(client: TestClient, authorization):
+    headers = {"Authorization": authorization} if authorization else {}
+    response = client.get("/metrics", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+
+
+def test_metrics_off_without_token(client: TestClient, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "")
+    response = client.get("/metrics", headers={"Authorization": "Bearer "})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_metrics_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "test", ("route",), buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 5):
+        histogram.observe(value, "/a")
+
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+    assert 'latency_seconds_sum{route="/a"} 5.65' in lines
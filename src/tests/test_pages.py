@@ -0,0 +1,91 @@
+import gzip
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette import status
+
+from ..routers.pages import PAGES_DIR
+from ..utils.page_cache import PageCache, brotli
+
+
+# Fixtures
+@pytest.fixture
+def client():
+    from ..main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+# Tests
+@pytest.mark.parametrize("page", ["login", "tasks", "account", "signup"])
+def test_pages_serve_page_sc_200(client: TestClient, page: str):
+    response = client.get(f"/ui/{page}", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "text/html; charset=utf-8"
+    assert "content-encoding" not in response.headers
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.headers["etag"].startswith('"')
+    assert response.content == (PAGES_DIR / f"{page}.html").read_bytes()
+
+
+def test_pages_serve_page_gzip(client: TestClient):
+    response = client.get("/ui/login", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].endswith('-gzip"')
+    assert response.headers["vary"] == "Accept-Encoding"
+    # httpx decodes the body transparently
+    assert response.content == (PAGES_DIR / "login.html").read_bytes()
+
+
+@pytest.mark.skipif(brotli is None, reason="brotli is not installed")
+def test_pages_serve_page_brotli(client: TestClient):
+    response = client.get("/ui/login", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["etag"].endswith('-br"')
+
+
+def test_pages_serve_page_sc_304(client: TestClient):
+    etag = client.get("/ui/tasks", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    response = client.get(
+        "/ui/tasks", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    # the identity representation has its own validator
+    response = client.get(
+        "/ui/tasks", headers={"Accept-Encoding": "identity", "If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_pages_serve_asset_sc_404(client: TestClient):
+    response = client.get("/ui/assets/missing.js")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_pages_page_cache_reloads_changed_files(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_text("<p>v1</p>" * 100)
+    cache = PageCache(tmp_path, check_interval=0)
+    cache.load()
+
+    first = cache.get("page.html")
+    assert first is not None
+    assert "gzip" not in first.bodies  # compressed on first use
+    assert gzip.decompress(cache.body(first, "gzip")) == page.read_bytes()
+    assert cache.body(first, "gzip") is first.bodies["gzip"]
+    assert cache.get("page.html") is first  # unchanged files are not re-read
+
+    page.write_text("<p>v2</p>" * 100)
+    os.utime(page, ns=(first.mtime_ns + 1, first.mtime_ns + 1))
+    second = cache.get("page.html")
+    assert second is not None
+    assert second.etag != first.etag
+    assert second.bodies["identity"] == page.read_bytes()
+
+    page.unlink()
+    assert cache.get("page.html") is None
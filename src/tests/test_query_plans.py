@@ -0,0 +1,174 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.pool import NullPool
+
+from ..database import POSTGRES_DB_URL
+from ..models import SEARCH_VECTOR_INDEX, Tasks
+from ..routers.tasks import build_task_list_query
+from ..utils.task_search import build_task_search_query
+from .conftest import engine
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+
+# Scratch database the Postgres plans are checked in (created next to
+# PGDATABASE, from the migrations, and dropped afterwards)
+PG_PLANS_DATABASE = "listo_query_plans_test"
+
+PG_PLANS_SEED = [
+    "INSERT INTO users (id, username, email, hashed_password, role) "
+    "SELECT n, 'user' || n, 'user' || n || '@mail.com', 'x', 'user' "
+    "FROM generate_series(1, 200) AS n",
+    "INSERT INTO tasks (title, details, priority, is_complete, owner_id) "
+    "SELECT 'task ' || n, CASE WHEN n % 7 = 0 THEN 'buy milk' END, "
+    "NULLIF(n % 6, 0), n % 3 = 0, n % 200 + 1 "
+    "FROM generate_series(1, 100000) AS n",
+    "ANALYZE",
+]
+
+TASK_LIST_CASES = [
+    ({}, ["ix_tasks_owner_id_id"]),
+    ({"after": [10]}, ["ix_tasks_owner_id_id"]),
+    ({"sort": "-id", "after": [10]}, ["ix_tasks_owner_id_id"]),
+    ({"sort": "priority"}, ["ix_tasks_owner_id_priority_id"]),
+    ({"sort": "-priority", "after": [3, 10]}, ["ix_tasks_owner_id_priority_id"]),
+    ({"priority": 2}, ["ix_tasks_owner_id_priority_id"]),
+    (
+        # the planner may trade the filter for index order on id
+        {"is_complete": False},
+        ["ix_tasks_owner_id_is_complete_priority_id", "ix_tasks_owner_id_id"],
+    ),
+    (
+        {"is_complete": True, "priority": 5, "sort": "priority"},
+        ["ix_tasks_owner_id_is_complete_priority_id"],
+    ),
+]
+
+
+# Pytest Fixtures
+@pytest.fixture(scope="module")
+def pg_engine():
+    """The migrated schema on PostgreSQL, where production plans are made."""
+    if not os.getenv("PGHOST"):
+        pytest.skip("PGHOST is not set: no PostgreSQL to check plans against")
+
+    admin_engine = create_engine(
+        POSTGRES_DB_URL, isolation_level="AUTOCOMMIT", poolclass=NullPool
+    )
+    with admin_engine.connect() as conn:
+        conn.execute(text(f"DROP DATABASE IF EXISTS {PG_PLANS_DATABASE}"))
+        conn.execute(text(f"CREATE DATABASE {PG_PLANS_DATABASE}"))
+    test_engine = create_engine(
+        POSTGRES_DB_URL.set(database=PG_PLANS_DATABASE), poolclass=NullPool
+    )
+    try:
+        result = subprocess.run(
+            [sys.executable, "-m", "alembic", "upgrade", "head"],
+            cwd=SRC_DIR,
+            env={**os.environ, "PGDATABASE": PG_PLANS_DATABASE},
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert result.returncode == 0, result.stderr
+        with test_engine.begin() as conn:
+            # Many owners with hundreds of tasks each: the planner only picks
+            # the index a query needs once statistics say how selective it is
+            for statement in PG_PLANS_SEED:
+                conn.execute(text(statement))
+        yield test_engine
+    finally:
+        test_engine.dispose()
+        with admin_engine.connect() as conn:
+            conn.execute(text(f"DROP DATABASE IF EXISTS {PG_PLANS_DATABASE}"))
+        admin_engine.dispose()
+
+
+# Helpers
+def explain(query) -> list[str]:
+    """Returns SQLite's EXPLAIN QUERY PLAN detail lines for `query`."""
+    compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return [row[-1] for row in rows]
+
+
+def assert_uses_index(plan: list[str], *index_names: str):
+    tasks_steps = [step for step in plan if " tasks " in f" {step} "]
+    assert tasks_steps, plan
+    for step in tasks_steps:
+        # "SCAN tasks" is a full table scan; we only accept index searches
+        assert step.startswith("SEARCH tasks USING"), plan
+    assert any(name in step for step in tasks_steps for name in index_names), plan
+
+
+def explain_postgres(pg_engine, query) -> list[dict]:
+    """
+    Every node of PostgreSQL's plan for `query`, with sequential scans ruled
+    out so an empty table still shows which index the query can use.
+    """
+    compiled = query.compile(pg_engine)
+    with pg_engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        [[plan]] = conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).all()
+    nodes, pending = [], [plan[0]["Plan"]]
+    while pending:
+        node = pending.pop()
+        nodes.append(node)
+        pending.extend(node.get("Plans", []))
+    return nodes
+
+
+def assert_postgres_uses_index(nodes: list[dict], *index_names: str):
+    assert not any(
+        node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "tasks"
+        for node in nodes
+    ), nodes
+    assert any(
+        node["Node Type"] in ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+        and node.get("Index Name") in index_names
+        for node in nodes
+    ), nodes
+
+
+# Tests
+@pytest.mark.parametrize("query_kwargs, index_names", TASK_LIST_CASES)
+def test_query_plans_task_list_uses_owner_index(
+    query_kwargs: dict, index_names: list[str]
+):
+    query = build_task_list_query(owner_id=1, **query_kwargs).limit(101)
+    assert_uses_index(explain(query), *index_names)
+
+
+def test_query_plans_task_by_id_uses_primary_key():
+    query = select(Tasks).where(Tasks.id == 1, Tasks.owner_id == 1)
+    plan = explain(query)
+    assert any("PRIMARY KEY" in step for step in plan), plan
+
+
+def test_query_plans_task_search_uses_full_text_index():
+    query = build_task_search_query("sqlite", owner_id=1, terms=["milk"]).limit(101)
+    plan = explain(query)
+    # the FTS5 index finds the matches, then each task is read by primary key
+    assert any(step.startswith("SCAN tasks_fts VIRTUAL TABLE") for step in plan), plan
+    assert "SEARCH tasks USING INTEGER PRIMARY KEY (rowid=?)" in plan, plan
+
+
+@pytest.mark.parametrize("query_kwargs, index_names", TASK_LIST_CASES)
+def test_query_plans_postgres_task_list_uses_owner_index(
+    pg_engine, query_kwargs: dict, index_names: list[str]
+):
+    query = build_task_list_query(owner_id=1, **query_kwargs).limit(101)
+    assert_postgres_uses_index(explain_postgres(pg_engine, query), *index_names)
+
+
+def test_query_plans_postgres_task_search_uses_full_text_index(pg_engine):
+    query = build_task_search_query("postgresql", owner_id=1, terms=["milk"])
+    nodes = explain_postgres(pg_engine, query.limit(101))
+    assert_postgres_uses_index(nodes, SEARCH_VECTOR_INDEX)
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from ..utils import rate_limit
+from ..utils.rate_limit import (
+    LocalSharedStore,
+    MemoryBucketStore,
+    RateLimiter,
+    client_address,
+)
+
+
+# Helpers
+def take_all(store, key: str, times: int, capacity: int = 3) -> list[float]:
+    async def run():
+        return [await store.take(key, capacity, per_second=1.0) for _ in range(times)]
+
+    return asyncio.run(run())
+
+
+def request_from(peer: str, forwarded_for: str | None = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 1234)})
+
+
+# Tests
+@pytest.mark.parametrize("store_class", [MemoryBucketStore, LocalSharedStore])
+def test_rate_limit_bucket_allows_burst_then_waits(store_class):
+    store = store_class()
+    waits = take_all(store, "1.2.3.4", times=4)
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert 0.9 < waits[3] <= 1.0  # one token refills per second
+    assert take_all(store, "5.6.7.8", times=1) == [0.0]  # buckets are per key
+
+
+def test_rate_limit_memory_store_evicts_least_recently_used():
+    store = MemoryBucketStore(max_keys=2)
+    for key in ("a", "b", "a", "c"):
+        take_all(store, key, times=1)
+
+    assert store.stats() == {"keys": 2, "evictions": 1}
+    assert take_all(store, "b", times=3) == [0.0, 0.0, 0.0]  # "b" started over
+
+
+def test_rate_limit_disabled_limiter_never_rejects():
+    limiter = RateLimiter("ip", burst=0, per_minute=0)
+
+    async def run():
+        for _ in range(100):
+            await limiter.check("1.2.3.4")
+
+    asyncio.run(run())
+    assert limiter.rejected == 0
+
+
+@pytest.mark.parametrize(
+    "trusted, peer, forwarded_for, expected",
+    [
+        ([], "10.0.0.5", "203.0.113.1", "10.0.0.5"),  # header ignored
+        (["10.0.0.0/8"], "192.0.2.7", "203.0.113.1", "192.0.2.7"),  # untrusted peer
+        (["10.0.0.0/8"], "10.0.0.5", "203.0.113.1", "203.0.113.1"),
+        (["10.0.0.0/8"], "10.0.0.5", "6.6.6.6, 203.0.113.1, 10.0.0.9", "203.0.113.1"),
+        (["*"], "10.0.0.5", "6.6.6.6, 203.0.113.1", "203.0.113.1"),
+        (["*"], "10.0.0.5", None, "10.0.0.5"),
+    ],
+)
+def test_rate_limit_client_address_behind_trusted_proxies(
+    monkeypatch, trusted, peer, forwarded_for, expected
+):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUSTED_PROXIES", trusted)
+    assert client_address(request_from(peer, forwarded_for)) == expected
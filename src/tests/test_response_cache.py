@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from ..utils.response_cache import (
+    CachedResponse,
+    LocalSharedCacheBackend,
+    MemoryCacheBackend,
+    ResponseCache,
+)
+
+
+# Helpers
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def response(body: bytes) -> CachedResponse:
+    return CachedResponse(body, {"ETag": '"1"', "Cache-Control": "no-cache"})
+
+
+# Tests
+@pytest.mark.parametrize("backend_class", [MemoryCacheBackend, LocalSharedCacheBackend])
+def test_response_cache_hit_until_invalidated(backend_class):
+    cache = ResponseCache("tasks", backend_class(), ttl_seconds=60)
+
+    cached, key = run(cache.get(1, "list", 100))
+    assert cached is None
+    run(cache.set(key, response(b"[1]")))
+
+    cached, _ = run(cache.get(1, "list", 100))
+    assert cached == response(b"[1]")
+    assert run(cache.get(1, "list", 50))[0] is None  # other parameters
+    assert run(cache.get(2, "list", 100))[0] is None  # other users
+
+    run(cache.invalidate(1))
+    assert run(cache.get(1, "list", 100))[0] is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["invalidations"] == 1
+
+
+@pytest.mark.parametrize("backend_class", [MemoryCacheBackend, LocalSharedCacheBackend])
+def test_response_cache_drops_fills_that_raced_a_write(backend_class):
+    cache = ResponseCache("tasks", backend_class(), ttl_seconds=60)
+
+    _, key = run(cache.get(1, "list"))  # a read starts...
+    run(cache.invalidate(1))  # ...a write commits...
+    run(cache.set(key, response(b"[stale]")))  # ...the read fills
+
+    assert run(cache.get(1, "list"))[0] is None
+
+
+def test_response_cache_evicted_generation_orphans_old_entries():
+    cache = ResponseCache("tasks", MemoryCacheBackend(max_entries=2), ttl_seconds=60)
+
+    _, key = run(cache.get(1, "list"))
+    run(cache.invalidate(1))
+    run(cache.set(key, response(b"[stale]")))
+    run(cache.get(2, "list"))  # user 1's generation is least recently used
+
+    # a new generation starts: the stale fill is never found again
+    assert run(cache.get(1, "list"))[0] is None
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_response_cache_roundtrips_serialized_responses():
+    cached = CachedResponse(b'[{"title": "a\\nb"}]', {"X-Next-Cursor": "abc"})
+    assert CachedResponse.loads(cached.dumps()) == cached
+
+
+def test_response_cache_disabled_never_stores():
+    cache = ResponseCache("tasks", ttl_seconds=0)
+    cached, key = run(cache.get(1, "list"))
+    run(cache.set(key, response(b"[]")))
+
+    assert cached is None and key is None
+    assert run(cache.get(1, "list")) == (None, None)
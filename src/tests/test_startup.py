@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from ..routers.pages import page_cache
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Wall time of a cold `import src.main`, everything it pulls in included. About
+# 1.0s of it is FastAPI (fastapi.openapi.models alone builds ~0.2s of pydantic
+# models) and SQLAlchemy's asyncio stack, which the app cannot start without.
+IMPORT_BUDGET_SECONDS = 1.6
+
+
+# Helpers
+def run_python(*args: str, **env: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=REPO_ROOT,
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+def cold_import_seconds(module: str) -> float:
+    """Seconds `import module` takes in a fresh interpreter."""
+    result = run_python(
+        "-c",
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)",
+    )
+    assert result.returncode == 0, result.stderr
+    return float(result.stdout)
+
+
+# Tests
+def test_startup_import_does_not_connect_to_database():
+    # Nothing listens there: any connection attempt at import would fail it
+    result = run_python(
+        "-c",
+        "from src.main import app; print(len(app.routes))",
+        PGHOST="127.0.0.1",
+        PGPORT="1",
+    )
+    assert result.returncode == 0, result.stderr
+    assert int(result.stdout) > 0
+
+
+def test_startup_import_time_budget():
+    # Best of three, so a busy machine does not fail it
+    seconds = min(cold_import_seconds("src.main") for _ in range(3))
+    assert seconds < IMPORT_BUDGET_SECONDS
+
+
+def test_startup_import_skips_sync_driver():
+    # Only Alembic needs it
+    result = run_python("-c", "import sys, src.main; print('psycopg2' in sys.modules)")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
+
+
+def test_startup_lifespan_loads_page_cache():
+    from ..main import create_app
+
+    app = create_app()
+    with TestClient(app) as client:
+        assert page_cache.stats()["files"] > 0
+        response = client.get("/ui/login", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+
+    # the compressed copies were built in the background during startup
+    login = page_cache.get("login.html")
+    assert set(page_cache.encodings) <= set(login.bodies)
@@ -1,22 +1,30 @@
 import pytest
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from fastapi.testclient import TestClient
 from starlette import status
+import time
 
-from ..database import get_db
-from ..models import Tasks
+from .. import database
+from ..database import PRIMARY_READS_COOKIE, get_db
+from ..models import Tasks, Users
+from ..routers.tasks import SEARCH_MAX_OFFSET, _encode_cursor
 from ..utils.auth import JwtUser, get_current_user
-from .conftest import TestingSessionLocal, engine
+from ..utils.response_cache import task_response_cache
+from .conftest import (
+    TestingSessionLocal,
+    TestingAsyncSessionLocal,
+    assert_max_queries,
+    async_engine,
+    engine,
+)
 
 
 # Dependency Overrides
-def override_get_db_dummy_tasks():
+async def override_get_db_dummy_tasks():
     """Creates a database session to your local db."""
-    db_test_session = TestingSessionLocal()
-    try:
+    async with TestingAsyncSessionLocal() as db_test_session:
         yield db_test_session
-    finally:
-        db_test_session.close()
 
 
 def override_get_current_user_dummy_tasks():
@@ -54,12 +62,32 @@ def dummy_tasks():
     yield dummy_tasks
 
 
+@pytest.fixture
+def task_owner():
+    """The users row behind the overridden current user (owns the tasks' version)"""
+    db = TestingSessionLocal()
+    owner = Users(
+        id=1,
+        username="test_user",
+        email="test_user@mail.com",
+        hashed_password="not-a-real-hash",
+        role="user",
+    )
+    db.add(owner)
+    db.commit()
+    db.close()
+    yield owner
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users;"))
+
+
 @pytest.fixture
 def clean_db_tasks():
     """Cleanup database after fixture-using tests"""
     yield
     with engine.begin() as conn:
         conn.execute(text("DELETE FROM tasks;"))
+        conn.execute(text("DELETE FROM task_summaries;"))
 
 
 # Tests
@@ -100,6 +128,143 @@ def test_tasks_get_all_tasks_sc_401(
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+def test_tasks_get_all_tasks_keyset_pagination(
+    client: TestClient, dummy_tasks: list[Tasks], clean_db_tasks
+):
+    seen_ids, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/tasks", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) <= 3
+        seen_ids += [task["id"] for task in response.json()]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert pages == 2
+    assert seen_ids == [dummy_task.id for dummy_task in dummy_tasks]
+
+
+def test_tasks_get_all_tasks_filter_and_sort(
+    client: TestClient, dummy_tasks: list[Tasks], clean_db_tasks
+):
+    response = client.get("/api/tasks", params={"sort": "-priority", "limit": 2})
+    assert response.status_code == status.HTTP_200_OK
+    assert [task["priority"] for task in response.json()] == [4, 3]
+
+    next_page = client.get(
+        "/api/tasks",
+        params={"sort": "-priority", "cursor": response.headers["X-Next-Cursor"]},
+    )
+    assert [task["priority"] for task in next_page.json()] == [2, 1]
+    assert "X-Next-Cursor" not in next_page.headers
+
+    response = client.get("/api/tasks", params={"priority": 3})
+    assert [task["title"] for task in response.json()] == ["task_3_title"]
+
+    response = client.get("/api/tasks", params={"is_complete": True})
+    assert response.json() == []
+
+
+@pytest.mark.parametrize("sort", ["priority", "-priority"])
+def test_tasks_get_all_tasks_keyset_pagination_null_priority(
+    client: TestClient, dummy_tasks: list[Tasks], clean_db_tasks, sort: str
+):
+    # a NULL priority sorts last (first when descending), like PostgreSQL does
+    null_ids = [
+        client.post("/api/tasks", json={"title": f"no priority {i}"}).json()["id"]
+        for i in range(2)
+    ]
+    for task_id in null_ids:
+        response = client.put(f"/api/tasks/{task_id}", json={"priority": None})
+        assert response.json()["priority"] is None
+
+    seen, cursor = [], None
+    while True:
+        params = {"sort": sort, "limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/tasks", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        seen += [(task["priority"], task["id"]) for task in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    ranked = sorted((t.priority, t.id) for t in dummy_tasks)
+    nulls = [(None, task_id) for task_id in null_ids]
+    if sort == "priority":
+        assert seen == ranked + nulls
+    else:
+        assert seen == nulls[::-1] + ranked[::-1]
+
+
+def test_tasks_get_all_tasks_compressed(client: TestClient, clean_db_tasks):
+    client.post("/api/tasks/bulk", json=[{"title": f"task_{i}"} for i in range(50)])
+
+    response = client.get("/api/tasks", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert len(response.json()) == 50
+
+    response = client.get("/api/tasks", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert len(response.json()) == 50
+
+
+def test_tasks_get_all_tasks_small_response_not_compressed(
+    client: TestClient, dummy_tasks: list[Tasks], clean_db_tasks
+):
+    response = client.get(
+        "/api/tasks", params={"limit": 1}, headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert "content-encoding" not in response.headers
+    assert len(response.json()) == 1
+
+
+def test_tasks_get_all_tasks_sc_400_invalid_cursor(
+    client: TestClient, dummy_tasks: list[Tasks], clean_db_tasks
+):
+    response = client.get("/api/tasks", params={"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # Cursors are bound to the sort order they were issued for
+    first_page = client.get("/api/tasks", params={"limit": 1})
+    response = client.get(
+        "/api/tasks",
+        params={"sort": "priority", "cursor": first_page.headers["X-Next-Cursor"]},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.parametrize(
+    "path, params, keys",
+    [
+        ("/api/tasks", {"sort": "id"}, [True]),  # JSON booleans are not ids
+        ("/api/tasks", {"sort": "id"}, [-1]),
+        ("/api/tasks", {"sort": "-id"}, [2**31]),  # out of INTEGER's range
+        ("/api/tasks", {"sort": "priority"}, [2**70, 1]),
+        ("/api/tasks", {"sort": "priority"}, [1, None]),  # no tie-breaking id
+        ("/api/tasks/search", {"q": "milk"}, [2**70]),
+        ("/api/tasks/search", {"q": "milk"}, [SEARCH_MAX_OFFSET + 1]),
+    ],
+)
+def test_tasks_sc_400_forged_cursor(
+    client: TestClient, task_owner: Users, path: str, params: dict, keys: list
+):
+    cursor = _encode_cursor(params.get("sort", "rank"), keys)
+    response = client.get(path, params={**params, "cursor": cursor})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Invalid cursor."
+
+
 def test_tasks_get_task_by_id_sc_200(
     client: TestClient, dummy_tasks: list[Tasks], clean_db_tasks
 ):
@@ -168,6 +333,114 @@ def test_tasks_post_task_sc_401(client: TestClient, clean_db_tasks):
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+def test_tasks_post_tasks_bulk_sc_201(client: TestClient, clean_db_tasks):
+    request_data = [
+        {"title": f"bulk_task_{i}", "details": f"bulk_details_{i}", "priority": 2}
+        for i in range(5)
+    ]
+    response = client.post("/api/tasks/bulk", json=request_data)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    body = response.json()
+    assert body["errors"] == []
+    assert [task["title"] for task in body["created"]] == [
+        item["title"] for item in request_data
+    ]
+    assert all(task["owner_id"] == 1 for task in body["created"])
+
+    stored = client.get("/api/tasks").json()
+    assert [task["id"] for task in stored] == [task["id"] for task in body["created"]]
+
+
+def test_tasks_post_tasks_bulk_reports_invalid_items(
+    client: TestClient, clean_db_tasks
+):
+    request_data = [
+        {"title": "valid_task", "priority": 1},
+        {"title": "", "priority": 1},
+        {"title": "bad_priority", "priority": 9},
+        "not-an-object",
+    ]
+    response = client.post("/api/tasks/bulk", json=request_data)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    body = response.json()
+    assert [task["title"] for task in body["created"]] == ["valid_task"]
+    assert [error["index"] for error in body["errors"]] == [1, 2, 3]
+
+    response = client.post("/api/tasks/bulk", json=request_data[1:])
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["created"] == []
+
+
+def test_tasks_post_tasks_bulk_sc_413(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, clean_db_tasks
+):
+    from ..routers import tasks
+
+    monkeypatch.setattr(tasks, "BULK_MAX_BATCH_SIZE", 2)
+    request_data = [{"title": f"bulk_task_{i}"} for i in range(3)]
+    response = client.post("/api/tasks/bulk", json=request_data)
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+
+def test_tasks_post_tasks_batch_sc_200(
+    client: TestClient, dummy_tasks: list[Tasks], clean_db_tasks
+):
+    task_ids = [dummy_task.id for dummy_task in dummy_tasks]
+    operations = [
+        {"op": "create", "task": {"title": "batch_task_1"}},
+        {"op": "create", "task": {"title": "batch_task_2", "priority": 5}},
+        {"op": "complete", "id": task_ids[0]},
+        {"op": "complete", "id": task_ids[1]},
+        {"op": "update", "id": task_ids[2], "changes": {"title": "renamed"}},
+        {"op": "delete", "id": task_ids[3]},
+        {"op": "delete", "id": 999},
+    ]
+    response = client.post("/api/tasks/batch", json={"operations": operations})
+    assert response.status_code == status.HTTP_200_OK
+
+    results = response.json()["results"]
+    assert [r["index"] for r in results] == list(range(len(operations)))
+    assert [r["status"] for r in results] == [201, 201, 200, 200, 200, 200, 404]
+    assert results[1]["task"]["priority"] == 5
+    assert results[2]["task"]["is_complete"] is True
+    assert results[4]["task"]["title"] == "renamed"
+    assert results[5]["task"] is None
+
+    stored = {task["id"]: task for task in client.get("/api/tasks").json()}
+    assert task_ids[3] not in stored
+    assert stored[task_ids[0]]["is_complete"] and stored[task_ids[1]]["is_complete"]
+    assert stored[task_ids[2]]["title"] == "renamed"
+    assert {results[0]["id"], results[1]["id"]} <= stored.keys()
+
+
+def test_tasks_post_tasks_batch_other_owner_sc_404(client: TestClient, clean_db_tasks):
+    db = TestingSessionLocal()
+    foreign_task = Tasks(title="foreign_task", priority=1, owner_id=2)
+    db.add(foreign_task)
+    db.commit()
+
+    operations = [
+        {"op": "update", "id": foreign_task.id, "changes": {"title": "stolen"}},
+        {"op": "complete", "id": foreign_task.id},
+        {"op": "delete", "id": foreign_task.id},
+    ]
+    response = client.post("/api/tasks/batch", json={"operations": operations})
+    assert [r["status"] for r in response.json()["results"]] == [404, 404, 404]
+
+    db.refresh(foreign_task)
+    assert foreign_task.title == "foreign_task"
+    assert foreign_task.is_complete is False
+    db.close()
+
+
+def test_tasks_post_tasks_batch_sc_422_unknown_op(client: TestClient):
+    operations = [{"op": "archive", "id": 1}]
+    response = client.post("/api/tasks/batch", json={"operations": operations})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 def test_tasks_update_task_sc_200(
     client: TestClient, dummy_tasks: list[Tasks], clean_db_tasks
 ):
@@ -273,3 +546,335 @@ def test_tasks_delete_task_sc_404(
 ):
     response = client.delete("/api/tasks/999")
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_tasks_update_and_delete_other_owner_sc_404(client: TestClient, clean_db_tasks):
+    db = TestingSessionLocal()
+    foreign_task = Tasks(title="foreign_task", priority=1, owner_id=2)
+    db.add(foreign_task)
+    db.commit()
+
+    response = client.put(f"/api/tasks/{foreign_task.id}", json={"title": "stolen"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = client.delete(f"/api/tasks/{foreign_task.id}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    db.refresh(foreign_task)
+    assert foreign_task.title == "foreign_task"
+    db.close()
+
+
+def test_tasks_update_task_partial_update(
+    client: TestClient, dummy_tasks: list[Tasks], clean_db_tasks
+):
+    dummy_task = dummy_tasks[1]
+    response = client.put(f"/api/tasks/{dummy_task.id}", json={"is_complete": True})
+    assert response.status_code == status.HTTP_200_OK
+
+    # Fields that were not sent keep their stored values
+    response_data = response.json()
+    assert response_data["is_complete"] is True
+    assert response_data["title"] == dummy_task.title
+    assert response_data["details"] == dummy_task.details
+    assert response_data["priority"] == dummy_task.priority
+
+
+def test_tasks_update_task_empty_body_changes_nothing(
+    client: TestClient,
+    task_owner: Users,
+    dummy_tasks: list[Tasks],
+    clean_db_tasks,
+    response_caches_enabled,
+):
+    task_url = f"/api/tasks/{dummy_tasks[0].id}"
+    etag = client.get("/api/tasks").headers["ETag"]
+    invalidations = task_response_cache.invalidations
+
+    response = client.put(task_url, json={})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == dummy_tasks[0].title
+    operations = [{"op": "update", "id": dummy_tasks[0].id, "changes": {}}]
+    response = client.post("/api/tasks/batch", json={"operations": operations})
+    assert response.json()["results"][0]["status"] == status.HTTP_200_OK
+
+    response = client.get("/api/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert task_response_cache.invalidations == invalidations
+    response = client.put("/api/tasks/999", json={})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_tasks_get_all_tasks_etag_sc_304(
+    client: TestClient, task_owner: Users, dummy_tasks: list[Tasks], clean_db_tasks
+):
+    response = client.get("/api/tasks")
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = client.get("/api/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    # Different page parameters are a different representation
+    response = client.get(
+        "/api/tasks", params={"limit": 2}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda c, task_id: c.post("/api/tasks", json={"title": "new_task_title"}),
+        lambda c, task_id: c.post("/api/tasks/bulk", json=[{"title": "bulk"}]),
+        lambda c, task_id: c.put(f"/api/tasks/{task_id}", json={"priority": 5}),
+        lambda c, task_id: c.delete(f"/api/tasks/{task_id}"),
+        lambda c, task_id: c.post(
+            "/api/tasks/batch",
+            json={"operations": [{"op": "complete", "id": task_id}]},
+        ),
+    ],
+)
+def test_tasks_etag_changes_after_write(
+    client: TestClient,
+    task_owner: Users,
+    dummy_tasks: list[Tasks],
+    clean_db_tasks,
+    write,
+):
+    task_id = dummy_tasks[0].id
+    list_etag = client.get("/api/tasks").headers["ETag"]
+    task_etag = client.get(f"/api/tasks/{task_id}").headers["ETag"]
+
+    assert write(client, task_id).status_code < 300
+
+    response = client.get("/api/tasks", headers={"If-None-Match": list_etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != list_etag
+    response = client.get(f"/api/tasks/{task_id}", headers={"If-None-Match": task_etag})
+    assert response.status_code != status.HTTP_304_NOT_MODIFIED
+
+
+def test_tasks_server_timing_header(
+    client: TestClient, task_owner: Users, dummy_tasks: list[Tasks], clean_db_tasks
+):
+    response = client.get("/api/tasks")
+    server_timing = response.headers["Server-Timing"]
+    # owner version (ETag) + the page itself
+    assert "db;dur=" in server_timing and 'desc="queries=2"' in server_timing
+    assert "serialize;dur=" in server_timing
+
+
+@pytest.mark.parametrize(
+    "method, url, body, max_queries",
+    [
+        ("GET", "/api/tasks", None, 2),
+        ("GET", "/api/tasks/{task_id}", None, 2),
+        ("GET", "/api/tasks/summary", None, 1),
+        ("GET", "/api/tasks/search?q=task_1", None, 2),
+        # writes: the write, the version bump and the counters upsert
+        ("POST", "/api/tasks", {"title": "new"}, 3),
+        ("POST", "/api/tasks/bulk", [{"title": f"t{i}"} for i in range(50)], 3),
+        ("PUT", "/api/tasks/{task_id}", {"title": "renamed"}, 2),  # nothing counted
+        ("PUT", "/api/tasks/{task_id}", {"priority": 2}, 4),  # + old values read
+        ("DELETE", "/api/tasks/{task_id}", None, 3),
+    ],
+)
+def test_tasks_query_counts(
+    client: TestClient,
+    task_owner: Users,
+    dummy_tasks: list[Tasks],
+    clean_db_tasks,
+    method: str,
+    url: str,
+    body,
+    max_queries: int,
+):
+    url = url.format(task_id=dummy_tasks[0].id)
+    with assert_max_queries(max_queries):
+        response = client.request(method, url, json=body)
+    assert response.status_code < 300
+
+
+def test_tasks_reads_cached_until_write(
+    client: TestClient,
+    task_owner: Users,
+    dummy_tasks: list[Tasks],
+    clean_db_tasks,
+    response_caches_enabled,
+):
+    task_url = f"/api/tasks/{dummy_tasks[0].id}"
+    listed = client.get("/api/tasks", params={"limit": 2})
+    task = client.get(task_url)
+
+    # repeated reads, conditional or not, never reach the database
+    with assert_max_queries(0):
+        cached = client.get("/api/tasks", params={"limit": 2})
+        assert cached.json() == listed.json()
+        assert cached.headers["ETag"] == listed.headers["ETag"]
+        assert cached.headers["X-Next-Cursor"] == listed.headers["X-Next-Cursor"]
+        assert client.get(task_url).json() == task.json()
+        not_modified = client.get(
+            task_url, headers={"If-None-Match": task.headers["ETag"]}
+        )
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # any write of the owner's drops every cached read
+    client.put(task_url, json={"title": "renamed"})
+    assert client.get(task_url).json()["title"] == "renamed"
+    assert client.get("/api/tasks", params={"limit": 2}).json()[0]["title"] == "renamed"
+
+    client.post("/api/tasks", json={"title": "new"})
+    assert len(client.get("/api/tasks").json()) == len(dummy_tasks) + 1
+
+
+def test_tasks_replica_reads_not_cached(
+    client: TestClient,
+    task_owner: Users,
+    dummy_tasks: list[Tasks],
+    clean_db_tasks,
+    response_caches_enabled,
+    monkeypatch,
+):
+    replica_sessions = async_sessionmaker(bind=async_engine, info={"replica": True})
+    monkeypatch.setattr(database, "ReplicaSessionLocal", replica_sessions)
+    task_url = f"/api/tasks/{dummy_tasks[0].id}"
+
+    # a lagging replica's rows could predate the client's last write
+    hits = task_response_cache.hits
+    client.get(task_url)
+    assert client.get(task_url).status_code == status.HTTP_200_OK
+    assert task_response_cache.hits == hits
+
+    # reads pinned to the primary after a write fill the cache as usual
+    client.cookies.set(PRIMARY_READS_COOKIE, str(time.time() + 5))
+    client.get(task_url)
+    with assert_max_queries(0):
+        assert client.get(task_url).status_code == status.HTTP_200_OK
+
+
+def test_tasks_summary_tracks_every_write(
+    client: TestClient, task_owner: Users, clean_db_tasks
+):
+    def expected_summary() -> dict:
+        tasks = client.get("/api/tasks").json()
+        return {
+            "total": len(tasks),
+            "completed": sum(task["is_complete"] for task in tasks),
+            "by_priority": {
+                str(p): sum(task["priority"] == p for task in tasks)
+                for p in range(1, 6)
+            },
+        }
+
+    empty = client.get("/api/tasks/summary").json()
+    assert empty == {
+        "total": 0,
+        "completed": 0,
+        "by_priority": {str(p): 0 for p in range(1, 6)},
+    }
+
+    bulk = [{"title": f"t{i}", "priority": i % 5 + 1} for i in range(12)]
+    ids = [t["id"] for t in client.post("/api/tasks/bulk", json=bulk).json()["created"]]
+    client.post("/api/tasks", json={"title": "one", "priority": 5})
+    client.put(f"/api/tasks/{ids[0]}", json={"priority": 3, "is_complete": True})
+    client.put(f"/api/tasks/{ids[1]}", json={"title": "renamed"})
+    client.delete(f"/api/tasks/{ids[2]}")
+    client.post(
+        "/api/tasks/batch",
+        json={
+            "operations": [
+                {"op": "complete", "id": ids[3]},
+                {"op": "complete", "id": ids[3]},  # already complete: no change
+                {"op": "update", "id": ids[4], "changes": {"priority": 1}},
+                {"op": "delete", "id": ids[5]},
+                {"op": "delete", "id": 999999},  # 404, nothing counted
+                {"op": "create", "task": {"title": "new", "priority": 2}},
+            ]
+        },
+    )
+
+    summary = client.get("/api/tasks/summary").json()
+    assert summary == expected_summary()
+    assert summary["total"] == 12 + 1 - 2 + 1
+    assert summary["completed"] == 2
+
+
+def test_tasks_search_ranks_and_paginates(
+    client: TestClient, task_owner: Users, clean_db_tasks
+):
+    client.post(
+        "/api/tasks/bulk",
+        json=[
+            {"title": "Call the bank", "details": "about the milk money"},
+            {"title": "Buy milk", "details": "and bread"},
+            {"title": "Write report", "details": "quarterly numbers"},
+            {"title": "Milk run", "details": "buy milk for the office"},
+        ],
+    )
+    other_owner_task = Tasks(title="Buy milk", details="not mine", owner_id=2)
+    db = TestingSessionLocal()
+    db.add(other_owner_task)
+    db.commit()
+    db.close()
+
+    response = client.get("/api/tasks/search", params={"q": "milk"})
+    assert response.status_code == status.HTTP_200_OK
+    titles = [task["title"] for task in response.json()]
+    # title matches rank above details-only ones; other owners never show up
+    assert set(titles) == {"Call the bank", "Buy milk", "Milk run"}
+    assert titles[-1] == "Call the bank"
+
+    # every word must match, stemmed, whatever the case and punctuation
+    response = client.get("/api/tasks/search", params={"q": 'BUYING "milk"!'})
+    assert {task["title"] for task in response.json()} == {"Buy milk", "Milk run"}
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "milk", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/tasks/search", params=params)
+        seen += [task["title"] for task in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == titles
+
+
+def test_tasks_search_follows_writes(
+    client: TestClient, task_owner: Users, clean_db_tasks
+):
+    def search(q: str) -> list[int]:
+        return [task["id"] for task in client.get(f"/api/tasks/search?q={q}").json()]
+
+    task_id = client.post("/api/tasks", json={"title": "Plan trip"}).json()["id"]
+    assert search("trip") == [task_id]
+
+    client.put(f"/api/tasks/{task_id}", json={"details": "to Lisbon"})
+    assert search("lisbon") == [task_id]
+
+    client.put(f"/api/tasks/{task_id}", json={"title": "Plan holiday"})
+    assert search("trip") == []
+    assert search("holiday") == [task_id]
+
+    client.delete(f"/api/tasks/{task_id}")
+    assert search("holiday") == []
+
+
+@pytest.mark.parametrize(
+    "params, status_code",
+    [
+        ({"q": "?!"}, status.HTTP_200_OK),  # no words: no results
+        ({"q": ""}, status.HTTP_422_UNPROCESSABLE_ENTITY),
+        ({"q": "milk", "cursor": "garbage"}, status.HTTP_400_BAD_REQUEST),
+    ],
+)
+def test_tasks_search_input(
+    client: TestClient, task_owner: Users, params: dict, status_code: int
+):
+    response = client.get("/api/tasks/search", params=params)
+    assert response.status_code == status_code
+    if status_code == status.HTTP_200_OK:
+        assert response.json() == []
@@ -6,8 +6,15 @@ from starlette import status
 from ..database import get_db
 from ..models import Users
 from ..utils.auth import JwtUser, get_current_user
-from ..utils.security import hash_password, verify_password
-from .conftest import TestingSessionLocal, engine
+from ..utils import rate_limit
+from ..utils.rate_limit import LocalSharedStore, ip_rate_limiter
+from ..utils.security import hash_password, verify_password, password_hasher
+from .conftest import (
+    TestingSessionLocal,
+    TestingAsyncSessionLocal,
+    assert_max_queries,
+    engine,
+)
 
 # Dummy Data
 test_user_passwords = [
@@ -36,13 +43,10 @@ test_user_phone_numbers_changed = [
 
 
 # Dependency Overrides
-def override_get_db_test_users():
+async def override_get_db_test_users():
     """Creates a database session to your local db."""
-    db_test_session = TestingSessionLocal()
-    try:
+    async with TestingAsyncSessionLocal() as db_test_session:
         yield db_test_session
-    finally:
-        db_test_session.close()
 
 
 def override_get_current_user_test_users():
@@ -206,6 +210,84 @@ def test_users_create_admin_forbidden_sc_422(client: TestClient, clean_db_users)
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+def test_users_create_user_sc_503_hashing_pool_full(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, clean_db_users
+):
+    # No capacity at all: every hashing call is rejected before reaching bcrypt
+    monkeypatch.setattr(password_hasher, "workers", 0)
+    monkeypatch.setattr(password_hasher, "max_queue", 0)
+    rejected_before = password_hasher.rejected
+
+    dummy_user = {
+        "role": "user",
+        "username": "test_user_1",
+        "first_name": "firstnameone",
+        "last_name": "lastnameone",
+        "password": test_user_passwords[0],
+        "email": "tu1@mail.com",
+        "phone_number": test_user_phone_numbers[0],
+    }
+    response = client.post("/api/users", json=dummy_user)
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
+    assert password_hasher.rejected == rejected_before + 1
+
+
+def test_users_create_user_sc_429_per_address(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, clean_db_users
+):
+    # Buckets in a shared store (stand-in) behave exactly like in-process ones
+    monkeypatch.setattr(ip_rate_limiter, "store", LocalSharedStore())
+    monkeypatch.setattr(ip_rate_limiter, "burst", 2)
+    hashed_before = password_hasher.completed
+
+    statuses = []
+    for i in range(3):
+        dummy_user = {
+            "role": "user",
+            "username": f"test_user_{i}",
+            "first_name": "firstname",
+            "last_name": "lastname",
+            "password": test_user_passwords[0],
+            "email": f"tu{i}@mail.com",
+        }
+        statuses.append(client.post("/api/users", json=dummy_user).status_code)
+
+    assert statuses == [201, 201, 429]
+    assert password_hasher.completed == hashed_before + 2
+    assert ip_rate_limiter.stats()["keys"] == 1
+
+
+def test_users_create_user_sc_429_per_forwarded_client(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, clean_db_users
+):
+    # Behind a trusted proxy, every client it forwards gets its own bucket
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUSTED_PROXIES", ["*"])
+    monkeypatch.setattr(ip_rate_limiter, "burst", 1)
+
+    statuses = []
+    for i, forwarded_for in enumerate(
+        ["203.0.113.1", "203.0.113.2", "198.51.100.9, 203.0.113.1"]
+    ):
+        dummy_user = {
+            "role": "user",
+            "username": f"test_user_{i}",
+            "first_name": "firstname",
+            "last_name": "lastname",
+            "password": test_user_passwords[0],
+            "email": f"tu{i}@mail.com",
+        }
+        response = client.post(
+            "/api/users", json=dummy_user, headers={"X-Forwarded-For": forwarded_for}
+        )
+        statuses.append(response.status_code)
+
+    # the third is the first client again, whatever it prepended to the header
+    assert statuses == [201, 201, 429]
+    assert ip_rate_limiter.stats()["keys"] == 2
+
+
 @pytest.mark.parametrize("user_id", [1, 2, 3])
 def test_users_get_user_sc_200(
     client: TestClient, user_id: int, dummy_users: list[Users], clean_db_users
@@ -258,6 +340,29 @@ def test_users_get_user_sc_409(
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+def test_users_get_user_cached_until_changed(
+    client: TestClient,
+    dummy_users: list[Users],
+    clean_db_users,
+    response_caches_enabled,
+):
+    response = client.get("/api/users")
+    assert response.json()["phone_number"] == test_user_phone_numbers[0]
+
+    with assert_max_queries(0):
+        assert client.get("/api/users").json() == response.json()
+
+    client.put(
+        "/api/phone-number",
+        json={
+            "password": test_user_passwords[0],
+            "new_phone_number": test_user_phone_numbers_changed[0],
+        },
+    )
+    response = client.get("/api/users")
+    assert response.json()["phone_number"] == test_user_phone_numbers_changed[0]
+
+
 @pytest.mark.parametrize("user_id", [1, 2, 3])
 def test_users_change_password_sc_200(
     client: TestClient, user_id: int, dummy_users: list[Users], clean_db_users
@@ -1,15 +1,21 @@
 from fastapi import Depends, HTTPException, Request
+from dataclasses import dataclass
 from datetime import timedelta, datetime, timezone
 from pydantic import BaseModel
 from jose import JWTError, jwt
-from sqlalchemy import select
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette import status
 from dotenv import load_dotenv
 from pathlib import Path
+import hashlib
 import os
+import time
 from ..database import get_db
-from ..utils.security import verify_password
+from ..utils.cache import TTLCache
+from ..utils.request_stats import timed
+from ..utils.security import password_hasher
 from ..models import Users
 
 # Initialize Auth Configuration
@@ -20,6 +26,9 @@ assert SECRET_KEY is not None, "SECRET_KEY must be set in .env"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
 
 
 class JwtUser(BaseModel):
@@ -28,7 +37,93 @@ class JwtUser(BaseModel):
     role: str
 
 
-def get_current_user(request: Request, db_session=Depends(get_db)) -> JwtUser:
+@dataclass(frozen=True)
+class UserState:
+    is_active: bool
+    role: str
+
+
+# user_id -> UserState. Entries are dropped on commit of any ORM change to the
+# user and expire after USER_CACHE_TTL_SECONDS, which bounds how long a user
+# changed outside this process (or via a bulk UPDATE) can keep authenticating.
+user_state_cache = TTLCache(
+    max_entries=USER_CACHE_MAX_ENTRIES, ttl_seconds=USER_CACHE_TTL_SECONDS
+)
+
+
+# sha256(access token) -> its verified claims, kept until the token's `exp`.
+# A token's signature and claims never change, so it is verified once; whether
+# its user may still authenticate is checked on every request (user_state_cache).
+token_claims_cache = TTLCache(
+    max_entries=TOKEN_CACHE_MAX_ENTRIES, ttl_seconds=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    changed = [
+        obj for obj in (*session.dirty, *session.deleted) if isinstance(obj, Users)
+    ]
+    if changed:
+        stale_ids = session.info.setdefault("stale_user_ids", set())
+        for user in changed:
+            user_state_cache.invalidate(user.id)
+            stale_ids.add(user.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    # Invalidate again once committed, so fills that read the pre-commit row
+    # in the meantime are not served until the TTL runs out.
+    for user_id in session.info.pop("stale_user_ids", ()):
+        user_state_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop("stale_user_ids", None)
+
+
+async def load_user_state(user_id: int, db_session: AsyncSession) -> UserState | None:
+    state = user_state_cache.get(user_id)
+    if state is not None:
+        return state
+
+    epoch = user_state_cache.epoch
+    row = (
+        await db_session.execute(
+            select(Users.is_active, Users.role).where(Users.id == user_id)
+        )
+    ).one_or_none()
+    if row is None:
+        return None
+
+    state = UserState(is_active=bool(row.is_active), role=str(row.role))
+    user_state_cache.set(user_id, state, if_epoch=epoch)
+    return state
+
+
+def decode_access_token(token: str) -> dict:
+    """Verified claims of `token`; raises JWTError if it is invalid or expired."""
+    key = hashlib.sha256(token.encode()).digest()
+    claims = token_claims_cache.get(key)
+    if claims is not None:
+        return claims
+
+    claims = jwt.decode(token, key=SECRET_KEY, algorithms=[ALGORITHM])  # type: ignore
+    exp = claims.get("exp")
+    token_claims_cache.set(key, claims, ttl_seconds=exp - time.time() if exp else None)
+    return claims
+
+
+async def get_current_user(
+    request: Request, db_session: AsyncSession = Depends(get_db)
+) -> JwtUser:
+    with timed("auth"):
+        return await _resolve_current_user(request, db_session)
+
+
+async def _resolve_current_user(request: Request, db_session: AsyncSession) -> JwtUser:
     token = request.cookies.get("access_token")
     if not token:
         raise HTTPException(
@@ -37,10 +132,9 @@ def get_current_user(request: Request, db_session=Depends(get_db)) -> JwtUser:
         )
 
     try:
-        payload = jwt.decode(token, key=SECRET_KEY, algorithms=[ALGORITHM])  # type: ignore
+        payload = decode_access_token(token)
         username = payload.get("sub")
         user_id = payload.get("id")
-        role = payload.get("role")
 
         if username is None or user_id is None:
             raise HTTPException(
@@ -48,14 +142,18 @@ def get_current_user(request: Request, db_session=Depends(get_db)) -> JwtUser:
                 detail="Invalid token payload.",
             )
 
-        # Optional: check user still exists
-        user = db_session.query(Users).filter(Users.id == user_id).first()
-        if not user:
+        # Check user still exists and is active (cached, see user_state_cache)
+        state = await load_user_state(int(user_id), db_session)
+        if state is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found."
             )
+        if not state.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="User is inactive."
+            )
 
-        return JwtUser(username=str(username), user_id=int(user_id), role=str(role))
+        return JwtUser(username=str(username), user_id=int(user_id), role=state.role)
 
     except JWTError:
         raise HTTPException(
@@ -64,17 +162,17 @@ def get_current_user(request: Request, db_session=Depends(get_db)) -> JwtUser:
         )
 
 
-def authenticate_user(
-    username: str, password: str, db_session: Session
+async def authenticate_user(
+    username: str, password: str, db_session: AsyncSession
 ) -> None | Users:
-    user = db_session.execute(
-        select(Users).where(Users.username == username)
+    user = (
+        await db_session.execute(select(Users).where(Users.username == username))
     ).scalar_one_or_none()
 
     if not user:
         return None
 
-    if not verify_password(
+    if not await password_hasher.verify(
         submitted_password=password, password_hash=str(user.hashed_password)
     ):
         return None
@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+import asyncio
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Bounded, thread-safe LRU mapping whose entries expire after a TTL.
+
+    `invalidate` bumps `epoch`; callers that read from the database on a miss
+    can pass the epoch they saw before the read to `set(..., if_epoch=...)`
+    so a fill that raced with an invalidation is dropped instead of
+    re-caching stale data.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.epoch = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl_seconds: float | None = None,
+        if_epoch: int | None = None,
+    ) -> bool:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0 or self.max_entries <= 0:
+            return False
+
+        with self._lock:
+            if if_epoch is not None and if_epoch != self.epoch:
+                return False
+
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self.epoch += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.epoch += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class LocalKeyValueStore:
+    """
+    In-process stand-in for a shared key-value store (e.g. Redis): bytes kept
+    under a TTL, and every call an awaited, locked round trip on wall-clock
+    time, the way a networked backend behaves. For tests and single-process
+    setups; it shares nothing across workers.
+    """
+
+    def __init__(self):
+        self._data: dict[str, tuple[float, bytes]] = {}  # key -> (expires, value)
+        self._lock = asyncio.Lock()
+
+        # Metrics
+        self.expirations = 0
+
+    def _live(self, key: str) -> bytes | None:
+        expires_at, value = self._data.get(key, (0.0, None))
+        if value is not None and expires_at <= time.time():
+            del self._data[key]
+            self.expirations += 1
+            return None
+        return value
+
+    async def update(
+        self,
+        key: str,
+        step: Callable[[bytes | None], tuple[bytes | None, float, Any]],
+    ) -> Any:
+        """
+        Atomically passes `key`'s value (None if unset or expired) to `step`,
+        which returns the new value (None to leave it as is), its TTL and a
+        result to hand back: what a server-side script does on a real store.
+        """
+        async with self._lock:
+            await asyncio.sleep(0)  # the round trip
+            value, ttl_seconds, result = step(self._live(key))
+            if value is not None:
+                self._data[key] = (time.time() + ttl_seconds, value)
+            return result
+
+    async def get(self, key: str) -> bytes | None:
+        async with self._lock:
+            await asyncio.sleep(0)
+            return self._live(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self.update(key, lambda _: (value, ttl_seconds, None))
+
+    async def add(self, key: str, value: bytes, ttl_seconds: float) -> bool:
+        """Sets `key` only if it has no value; returns whether it did."""
+        return await self.update(
+            key,
+            lambda current: (
+                (None, 0.0, False) if current is not None else (value, ttl_seconds, True)
+            ),
+        )
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
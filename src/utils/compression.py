@@ -0,0 +1,217 @@
+from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import os
+import zlib
+
+from .http import choose_encoding
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+# Single-body responses smaller than this are sent as is
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+# request.state attribute that turns compression off for one request
+SKIP_COMPRESSION_STATE = "skip_compression"
+
+
+def skip_compression(request: Request) -> None:
+    """Route/router dependency that opts its responses out of compression."""
+    setattr(request.state, SKIP_COMPRESSION_STATE, True)
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_SYNC_FLUSH if flush else 0)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + self._compressor.flush() if flush else out
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        out = self._compressor.compress(data)
+        return (
+            out + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            if flush
+            else out
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with the best coding the client accepts.
+
+    Codings are tried in server preference order (zstd, br, gzip), skipping
+    those whose library is not installed. A response is left alone when it
+    already has a Content-Encoding, is not a compressible media type, opted
+    out via `skip_compression`, or is a single body smaller than
+    `minimum_size`. Streamed bodies are compressed chunk by chunk and flushed
+    after each one, so clients still see data as it is produced.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.zstd_level = zstd_level
+
+    @property
+    def encodings(self) -> tuple[str, ...]:
+        return tuple(
+            coding
+            for coding, available in (
+                ("zstd", zstandard is not None),
+                ("br", brotli is not None),
+                ("gzip", True),
+            )
+            if available
+        )
+
+    def _encoder(self, coding: str):
+        if coding == "zstd":
+            return _ZstdEncoder(self.zstd_level)
+        if coding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding"), self.encodings
+        )
+        if coding == "identity":
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressedResponder(self, scope, coding)(receive, send)
+
+
+class _CompressedResponder:
+    """Per-request state: holds back `http.response.start` until the first
+    body chunk shows whether the response is worth compressing."""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, coding: str):
+        self.middleware = middleware
+        self.scope = scope
+        self.coding = coding
+        self.start_message: Message | None = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.middleware.app(self.scope, receive, self.send_wrapper)
+
+    def _should_compress(self, headers: MutableHeaders) -> bool:
+        if self.scope.get("state", {}).get(SKIP_COMPRESSION_STATE):
+            return False
+        if "content-encoding" in headers:
+            return False
+        if self.start_message["status"] in (204, 304):
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _start_compressed(self) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.coding
+        headers.add_vary_header("Accept-Encoding")
+        del headers["Content-Length"]
+        # The bytes differ from the uncompressed representation
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        self.encoder = self.middleware._encoder(self.coding)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            compressible = self._should_compress(headers)
+            if not compressible or (
+                not more_body and len(body) < self.middleware.minimum_size
+            ):
+                if compressible:
+                    # a larger body of the same resource would be compressed
+                    headers.add_vary_header("Accept-Encoding")
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            self._start_compressed()
+            if not more_body:
+                out = self.encoder.compress(body, flush=False) + self.encoder.finish()
+                headers["Content-Length"] = str(len(out))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": out})
+                return
+            await self.send(self.start_message)
+
+        out = self.encoder.compress(body, flush=more_body)
+        if not more_body:
+            out += self.encoder.finish()
+        await self.send(
+            {"type": "http.response.body", "body": out, "more_body": more_body}
+        )
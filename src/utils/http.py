@@ -0,0 +1,37 @@
+def parse_accept_encoding(header: str | None) -> dict[str, float]:
+    """Returns {coding: q} for an Accept-Encoding header ("*" is kept as is)."""
+    accepted: dict[str, float] = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header: str | None, available) -> str:
+    """Picks the first of `available` (in preference order) the client accepts."""
+    accepted = parse_accept_encoding(header)
+    for coding in available:
+        if coding == "identity":
+            continue
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > 0:
+            return coding
+    return "identity"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
@@ -0,0 +1,264 @@
+from bisect import bisect_left
+from typing import Callable, Iterable
+import hmac
+import os
+import time
+
+from starlette import status
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Token scrapers must send (Authorization: Bearer <token>). Unset, /metrics is
+# off (404): it exposes traffic, error rates and capacity to anyone.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Prometheus client defaults (seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10)
+
+# Route label for requests no route matched (keeps scanners from adding series)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: tuple[str, ...], labelvalues: tuple) -> str:
+    if not labelnames:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"'
+        for name, value in zip(labelnames, labelvalues)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> list[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} "
+            f"{_format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labelvalues, amount: float = 1) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues) -> None:
+        self._values[labelvalues] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues) -> None:
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    (*self.labelnames, "le"), (*labels, _format_value(float(bound)))
+                )
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds metrics updated inline (counters, gauges, histograms) plus stats
+    collectors read only at scrape time, so components that already keep a
+    `.stats()` dict cost nothing extra per request.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._metrics: list[_Metric] = []
+        self._collectors: list[tuple[str, Callable[[], dict], frozenset[str]]] = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(
+            Counter(f"{self.namespace}_{name}", documentation, labelnames)
+        )
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(
+            Gauge(f"{self.namespace}_{name}", documentation, labelnames)
+        )
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(
+            Histogram(f"{self.namespace}_{name}", documentation, labelnames, buckets)
+        )
+
+    def add_stats_collector(
+        self, prefix: str, stats: Callable[[], dict], counters: Iterable[str] = ()
+    ) -> None:
+        """
+        Exports every numeric value of `stats()` as `<namespace>_<prefix>_<key>`:
+        a counter for keys in `counters` (which get a `_total` suffix), a gauge
+        otherwise.
+        """
+        self._collectors.append((prefix, stats, frozenset(counters)))
+
+    def _render_collectors(self) -> list[str]:
+        lines = []
+        for prefix, stats, counters in self._collectors:
+            for key, value in stats().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{self.namespace}_{prefix}_{key}"
+                if key in counters:
+                    name, kind = f"{name}_total", "counter"
+                else:
+                    kind = "gauge"
+                lines += [
+                    f"# HELP {name} {prefix} {key.replace('_', ' ')}",
+                    f"# TYPE {name} {kind}",
+                    f"{name} {_format_value(value)}",
+                ]
+        return lines
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        lines += self._render_collectors()
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry("listo")
+
+http_requests = registry.counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route template.",
+    ("method", "route"),
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served."
+)
+
+
+class MetricsMiddleware:
+    """
+    Counts and times every HTTP request. Labels use the matched route's path
+    template (`/api/tasks/{task_id}`), never the raw path, so cardinality is
+    bounded by the number of routes.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            http_requests.inc(method, route_path, status_code)
+            http_request_duration.observe(elapsed, method, route_path)
+
+
+def require_metrics_token(request: Request) -> None:
+    """Dependency of the scrape endpoint: 404 while METRICS_TOKEN is unset,
+    401 unless the request carries it as a bearer token."""
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode(), METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,145 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+import gzip
+import hashlib
+import mimetypes
+import threading
+import time
+
+try:
+    import brotli
+except ImportError:  # optional: pages are still served gzip/identity without it
+    brotli = None
+
+
+@dataclass(frozen=True)
+class CachedFile:
+    media_type: str
+    mtime_ns: int
+    size: int
+    etag: str  # hash of the raw bytes; each encoding gets its own suffix
+    # encoding -> body; compressed bodies are added on first use (or precompress)
+    bodies: dict[str, bytes] = field(repr=False)
+
+
+class PageCache:
+    """
+    Keeps every file under `root` in memory, with its compressed copies.
+
+    Files are read once and each compressed copy is built once, on first use
+    or by `precompress()` (run off the startup path); afterwards the directory
+    is only re-scanned (a stat per file) when at least `check_interval` seconds have
+    passed since the last scan, and only changed files are re-read. An
+    interval of 0 re-scans on every lookup, a negative one never does.
+    """
+
+    # Below this, compression costs more than it saves
+    MIN_COMPRESS_SIZE = 256
+
+    def __init__(self, root: Path, check_interval: float = 2.0):
+        self.root = root
+        self.check_interval = check_interval
+        self._files: dict[str, CachedFile] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    @property
+    def encodings(self) -> tuple[str, ...]:
+        """Content codings we can serve, most preferred first."""
+        return ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def _build(self, path: Path, mtime_ns: int) -> CachedFile:
+        raw = path.read_bytes()
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if media_type.startswith("text/") or media_type == "application/javascript":
+            media_type += "; charset=utf-8"
+        return CachedFile(
+            media_type=media_type,
+            mtime_ns=mtime_ns,
+            size=len(raw),
+            etag=hashlib.blake2b(raw, digest_size=16).hexdigest(),
+            bodies={"identity": raw},
+        )
+
+    def encodings_for(self, cached: CachedFile) -> list[str]:
+        """Codings worth serving `cached` in (none for small files)."""
+        return list(self.encodings) if cached.size >= self.MIN_COMPRESS_SIZE else []
+
+    def body(self, cached: CachedFile, encoding: str) -> bytes:
+        """`cached` in `encoding`, compressing (once) if not done yet."""
+        body = cached.bodies.get(encoding)
+        if body is None:
+            raw = cached.bodies["identity"]
+            if encoding == "br":
+                body = brotli.compress(raw, quality=11)
+            else:
+                body = gzip.compress(raw, compresslevel=9, mtime=0)
+            cached.bodies[encoding] = body
+        return body
+
+    def precompress(self) -> None:
+        """Builds every compressed copy now rather than on first request."""
+        for cached in list(self._files.values()):
+            for encoding in self.encodings_for(cached):
+                self.body(cached, encoding)
+
+    def load(self) -> None:
+        """(Re)scans `root`, re-reading only files whose mtime or size changed."""
+        files: dict[str, CachedFile] = {}
+        for path in sorted(self.root.rglob("*")):
+            if not path.is_file():
+                continue
+            stat = path.stat()
+            name = path.relative_to(self.root).as_posix()
+            cached = self._files.get(name)
+            if (
+                cached is None
+                or cached.mtime_ns != stat.st_mtime_ns
+                or cached.size != stat.st_size
+            ):
+                cached = self._build(path, stat.st_mtime_ns)
+                self.reloads += 1
+            files[name] = cached
+
+        self._files = files
+        self._last_check = time.monotonic()
+
+    def _refresh_due(self) -> bool:
+        if not self._last_check:  # never loaded
+            return True
+        if self.check_interval < 0:
+            return False
+        return time.monotonic() - self._last_check >= self.check_interval
+
+    def _refresh_if_due(self) -> None:
+        if not self._refresh_due():
+            return
+        with self._lock:
+            if self._refresh_due():
+                self.load()
+
+    def get(self, name: str) -> CachedFile | None:
+        self._refresh_if_due()
+        cached = self._files.get(name)
+        if cached is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return cached
+
+    def stats(self) -> dict:
+        return {
+            "files": len(self._files),
+            "bytes": sum(
+                len(body) for f in self._files.values() for body in f.bodies.values()
+            ),
+            "encodings": list(self.encodings),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+        }
@@ -0,0 +1,214 @@
+from collections import OrderedDict
+from fastapi import HTTPException, Request
+from starlette import status
+import ipaddress
+import math
+import os
+import time
+
+from .cache import LocalKeyValueStore
+
+# Token buckets for the bcrypt-heavy endpoints (login, sign-up): each key may
+# burst up to BURST attempts, refilled at PER_MINUTE per minute (0 disables)
+RATE_LIMIT_IP_BURST = int(os.getenv("RATE_LIMIT_IP_BURST", "30"))
+RATE_LIMIT_IP_PER_MINUTE = float(os.getenv("RATE_LIMIT_IP_PER_MINUTE", "30"))
+RATE_LIMIT_USERNAME_BURST = int(os.getenv("RATE_LIMIT_USERNAME_BURST", "5"))
+RATE_LIMIT_USERNAME_PER_MINUTE = float(os.getenv("RATE_LIMIT_USERNAME_PER_MINUTE", "5"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+# Reverse proxies whose X-Forwarded-For is believed when limiting by address:
+# comma-separated addresses/networks, or "*" for whatever peer connects (only
+# when the app cannot be reached but through the proxy, as on Render). Unset,
+# every client behind a proxy would share the proxy's address and bucket.
+RATE_LIMIT_TRUSTED_PROXIES = [
+    proxy.strip()
+    for proxy in os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "").split(",")
+    if proxy.strip()
+]
+
+
+def _refill(tokens: float, elapsed: float, capacity: int, per_second: float) -> float:
+    return min(capacity, tokens + max(0.0, elapsed) * per_second)
+
+
+class BucketStore:
+    """
+    Where bucket state lives. `take` must be atomic per key: a shared store
+    (e.g. Redis) would run it as one server-side script, so every worker
+    draws from the same buckets.
+    """
+
+    async def take(self, key: str, capacity: int, per_second: float) -> float:
+        """Takes a token from `key`'s bucket. Returns 0 if one was available,
+        else the seconds until one will be (nothing is taken then)."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryBucketStore(BucketStore):
+    """
+    Per-process buckets, bounded to `max_keys` (least recently used dropped
+    first). A dropped bucket starts over full, so eviction only ever admits.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+        # Metrics
+        self.evictions = 0
+
+    async def take(self, key: str, capacity: int, per_second: float) -> float:
+        # No awaits in here, so this is atomic on the event loop
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = _refill(tokens, now - updated_at, capacity, per_second)
+        wait = 0.0 if tokens >= 1 else (1 - tokens) / per_second
+        if not wait:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+            self.evictions += 1
+        return wait
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def stats(self) -> dict:
+        return {"keys": len(self._buckets), "evictions": self.evictions}
+
+
+class LocalSharedStore(BucketStore):
+    """
+    Buckets kept serialized in a `LocalKeyValueStore` (see utils/cache.py),
+    each `take` one atomic update, as a script would run on a shared store.
+    """
+
+    def __init__(self):
+        self._store = LocalKeyValueStore()
+
+    async def take(self, key: str, capacity: int, per_second: float) -> float:
+        def step(value: bytes | None) -> tuple[bytes, float, float]:
+            now = time.time()
+            if value is not None:
+                tokens, updated_at = map(float, value.split(b":"))
+            else:
+                tokens, updated_at = capacity, now
+            tokens = _refill(tokens, now - updated_at, capacity, per_second)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / per_second
+            if not wait:
+                tokens -= 1
+            # An untouched bucket is full again after this long: let it expire
+            ttl = (capacity - tokens) / per_second
+            return f"{tokens}:{now}".encode(), ttl, wait
+
+        return await self._store.update(key, step)
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def stats(self) -> dict:
+        return {"keys": len(self._store)}
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter: each key gets `burst` attempts, refilled at
+    `per_minute` a minute. Check it before doing expensive work, so rejected
+    attempts cost next to nothing.
+    """
+
+    def __init__(
+        self, name: str, burst: int, per_minute: float, store: BucketStore | None = None
+    ):
+        self.name = name
+        self.burst = burst
+        self.per_minute = per_minute
+        self.store = store if store is not None else MemoryBucketStore()
+
+        # Metrics
+        self.allowed = 0
+        self.rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.burst > 0 and self.per_minute > 0
+
+    async def check(self, key: str) -> None:
+        """Raises a 429 (with Retry-After) when `key` is over its limit."""
+        if not self.enabled:
+            return
+        wait = await self.store.take(key, self.burst, self.per_minute / 60)
+        if wait:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts. Please retry later.",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+        self.allowed += 1
+
+    def stats(self) -> dict:
+        return {
+            "burst": self.burst,
+            "per_minute": self.per_minute,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            **self.store.stats(),
+        }
+
+
+ip_rate_limiter = RateLimiter("ip", RATE_LIMIT_IP_BURST, RATE_LIMIT_IP_PER_MINUTE)
+username_rate_limiter = RateLimiter(
+    "username", RATE_LIMIT_USERNAME_BURST, RATE_LIMIT_USERNAME_PER_MINUTE
+)
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(proxy, strict=False)
+        for proxy in RATE_LIMIT_TRUSTED_PROXIES
+        if proxy != "*"
+    )
+
+
+def client_address(request: Request) -> str:
+    """
+    The client's address: the peer's, unless it is a trusted proxy, in which
+    case the nearest X-Forwarded-For hop that is not one. Hops further left
+    are whatever the client sent, so they are never believed.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if "*" not in RATE_LIMIT_TRUSTED_PROXIES and not _is_trusted_proxy(peer):
+        return peer
+    hops = [
+        hop.strip()
+        for header in request.headers.getlist("X-Forwarded-For")
+        for hop in header.split(",")
+        if hop.strip()
+    ]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+async def check_credential_rate_limits(request: Request, username: str) -> None:
+    """
+    Admission control for endpoints that hash a password: by client address
+    first (a rejected address does not use up the username's budget), then by
+    username, however many addresses it is tried from.
+    """
+    await ip_rate_limiter.check(client_address(request))
+    await username_rate_limiter.check(username.strip().lower())
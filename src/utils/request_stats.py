@@ -0,0 +1,118 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import logging
+import os
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Requests above either budget are logged as warnings (0 disables a budget)
+REQUEST_QUERY_BUDGET = int(os.getenv("REQUEST_QUERY_BUDGET", "20"))
+REQUEST_DB_BUDGET_MS = float(os.getenv("REQUEST_DB_BUDGET_MS", "200"))
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    timings: dict[str, float] = field(default_factory=dict)  # phase -> seconds
+
+    def server_timing(self) -> str:
+        entries = [f'db;dur={self.db_seconds * 1000:.1f};desc="queries={self.queries}"']
+        entries += [
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.timings.items()
+        ]
+        return ", ".join(entries)
+
+
+# Set per request by ServerTimingMiddleware; the object is shared (not copied)
+# with SQLAlchemy's greenlets and threadpool dependencies, so they update it.
+current_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+@contextmanager
+def timed(phase: str):
+    """Adds the block's duration to the current request's `phase` timing."""
+    stats = current_request_stats.get()
+    if stats is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started_at
+        stats.timings[phase] = stats.timings.get(phase, 0.0) + elapsed
+
+
+# SQLAlchemy cursor events (registered in database.py). A connection runs one
+# statement at a time, so it keeps a single start time: after_cursor_execute
+# never fires for a statement that raised, and handle_error clears it instead
+# (pooled connections live long; nothing may pile up in their info).
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request_stats.get() is not None:
+        conn.info["query_started_at"] = time.perf_counter()
+
+
+def _count_query(conn) -> None:
+    started_at = conn.info.pop("query_started_at", None)
+    stats = current_request_stats.get()
+    if stats is None or started_at is None:
+        return
+    stats.queries += 1
+    stats.db_seconds += time.perf_counter() - started_at
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _count_query(conn)
+
+
+def handle_error(exception_context) -> None:
+    # A failed statement (e.g. an IntegrityError) still took database time
+    if exception_context.connection is not None:
+        _count_query(exception_context.connection)
+
+
+class ServerTimingMiddleware:
+    """
+    Collects per-request query count and DB time (plus any `timed` phases),
+    reports them in a `Server-Timing` header, and logs requests over budget.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request_stats.reset(token)
+            over_queries = 0 < REQUEST_QUERY_BUDGET < stats.queries
+            over_db_time = 0 < REQUEST_DB_BUDGET_MS < stats.db_seconds * 1000
+            if over_queries or over_db_time:
+                logger.warning(
+                    "%s %s over budget: %d queries, %.1f ms in the database",
+                    scope["method"],
+                    scope["path"],
+                    stats.queries,
+                    stats.db_seconds * 1000,
+                )
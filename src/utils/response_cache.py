@@ -0,0 +1,220 @@
+from dataclasses import dataclass
+from fastapi import Request, Response
+from starlette import status
+from typing import Hashable
+from uuid import uuid4
+import hashlib
+import json
+import os
+
+from .cache import LocalKeyValueStore, TTLCache
+from .http import etag_matches
+
+# Serialized read responses, per user (0, the default, disables). The built-in
+# backend is per process and invalidation only reaches this process's memory:
+# only enable it for a single worker, or keep the TTL to a second or two, as it
+# bounds how stale another worker's copy can be. Replica reads are never cached.
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "0"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+
+
+class CacheBackend:
+    """
+    Where cached responses live: bytes under string keys, each with a TTL. A
+    shared store (e.g. Redis or memcached) lets every worker see the same
+    entries and invalidations.
+    """
+
+    async def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        raise NotImplementedError
+
+    async def add(self, key: str, value: bytes, ttl_seconds: float) -> bool:
+        """Sets `key` only if it has no value (atomically); returns whether it did."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU, bounded to `max_entries`."""
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+    ):
+        self._entries = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._entries.set(key, value, ttl_seconds=ttl_seconds)
+
+    async def add(self, key: str, value: bytes, ttl_seconds: float) -> bool:
+        # No awaits in here, so this is atomic on the event loop
+        if self._entries.get(key) is not None:
+            return False
+        return self._entries.set(key, value, ttl_seconds=ttl_seconds)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        stats = self._entries.stats()
+        return {
+            key: stats[key]
+            for key in ("size", "max_entries", "evictions", "expirations")
+        }
+
+
+class LocalSharedCacheBackend(CacheBackend):
+    """A `LocalKeyValueStore` (see utils/cache.py): a shared store's behavior
+    in one process, for tests."""
+
+    def __init__(self):
+        self._store = LocalKeyValueStore()
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._store.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self._store.set(key, value, ttl_seconds)
+
+    async def add(self, key: str, value: bytes, ttl_seconds: float) -> bool:
+        return await self._store.add(key, value, ttl_seconds)
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._store), "expirations": self._store.expirations}
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A JSON response body and the headers it was sent with."""
+
+    body: bytes
+    headers: dict[str, str]
+
+    def dumps(self) -> bytes:
+        return json.dumps(self.headers).encode() + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CachedResponse":
+        headers, body = data.split(b"\n", 1)
+        return cls(body=body, headers=json.loads(headers))
+
+    def to_response(self, request: Request) -> Response:
+        """The cached response, or a 304 when the client already has it."""
+        etag = self.headers.get("ETag")
+        if etag and etag_matches(request.headers.get("If-None-Match"), etag):
+            headers = {"ETag": etag, "Cache-Control": self.headers["Cache-Control"]}
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(self.body, media_type="application/json", headers=self.headers)
+
+
+class ResponseCache:
+    """
+    Serialized read responses, kept per user and dropped by every write to
+    that user's data (`invalidate`, after the write commits).
+
+    A user's entries are keyed under their current generation, a random token
+    replaced on invalidation, so one write drops them all however many there
+    are. `get` pins the generation before the database read: a response read
+    before a write committed is filed under the old generation and never
+    served. Tokens are never reused: a generation that expired or was evicted
+    is replaced by a new one (set only if still absent), which orphans every
+    entry filed before.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        backend: CacheBackend | None = None,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+    ):
+        self.namespace = namespace
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl_seconds = ttl_seconds
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def _generation_key(self, user_id: int) -> str:
+        return f"{self.namespace}:{user_id}"
+
+    async def _generation(self, user_id: int) -> str:
+        key = self._generation_key(user_id)
+        generation = await self.backend.get(key)
+        if generation is None:
+            generation = uuid4().hex.encode()
+            if not await self.backend.add(key, generation, self.ttl_seconds):
+                # Another request started one first (if it is gone already,
+                # ours files under a token nobody else uses: a wasted fill)
+                generation = await self.backend.get(key) or generation
+        return generation.decode()
+
+    async def get(
+        self, user_id: int, *parts: Hashable
+    ) -> tuple[CachedResponse | None, str | None]:
+        """
+        The user's cached response for `parts` (the request parameters) if
+        any, and the key to `set` it under after a miss (None if disabled).
+        """
+        if not self.enabled:
+            return None, None
+        generation = await self._generation(user_id)
+        digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=8)
+        key = f"{self._generation_key(user_id)}:{generation}:{digest.hexdigest()}"
+        cached = await self.backend.get(key)
+        if cached is None:
+            self.misses += 1
+            return None, key
+        self.hits += 1
+        return CachedResponse.loads(cached), key
+
+    async def set(self, key: str | None, response: CachedResponse) -> None:
+        if key is not None:
+            await self.backend.set(key, response.dumps(), self.ttl_seconds)
+
+    async def invalidate(self, user_id: int) -> None:
+        if not self.enabled:
+            return
+        self.invalidations += 1
+        await self.backend.set(
+            self._generation_key(user_id), uuid4().hex.encode(), self.ttl_seconds
+        )
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            **self.backend.stats(),
+        }
+
+
+# GET /api/tasks and /api/tasks/{task_id}; GET /api/users
+task_response_cache = ResponseCache("tasks")
+user_response_cache = ResponseCache("users")
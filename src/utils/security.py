@@ -1,4 +1,17 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException
+from starlette import status
+import asyncio
 import bcrypt
+import os
+import time
+
+# Hashing Pool Configuration
+HASH_POOL_KIND = os.getenv("HASH_POOL_KIND", "thread")  # "thread" | "process"
+HASH_POOL_WORKERS = int(
+    os.getenv("HASH_POOL_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+HASH_POOL_MAX_QUEUE = int(os.getenv("HASH_POOL_MAX_QUEUE", "64"))
 
 
 def hash_password(password: str) -> str:
@@ -11,3 +24,112 @@ def verify_password(submitted_password: str, password_hash: str) -> bool:
     return bcrypt.checkpw(
         submitted_password.encode("utf-8"), password_hash.encode("utf-8")
     )
+
+
+def _timed_call(fn, submitted_at: float, *args):
+    """Runs on the worker; reports queue wait and run time alongside the result."""
+    started_at = time.monotonic()
+    result = fn(*args)
+    return started_at - submitted_at, time.monotonic() - started_at, result
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated worker pool so it never blocks the event loop.
+
+    At most `workers + max_queue` calls are admitted at once; anything beyond
+    that is rejected immediately with a 503 instead of piling up behind a
+    login burst.
+    """
+
+    def __init__(self, workers: int, max_queue: int, kind: str = "thread"):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.kind = kind
+        self._executor: Executor | None = None
+        self._in_flight = 0
+
+        # Metrics
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_hash_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self._in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy. Please retry shortly.",
+                headers={"Retry-After": "1"},
+            )
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            wait, elapsed, result = await loop.run_in_executor(
+                self._get_executor(), _timed_call, fn, time.monotonic(), *args
+            )
+        finally:
+            self._in_flight -= 1
+
+        self.completed += 1
+        self.total_wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        self.total_hash_seconds += elapsed
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, submitted_password: str, password_hash: str) -> bool:
+        return await self._run(verify_password, submitted_password, password_hash)
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._in_flight - self.workers)
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": (
+                self.total_wait_seconds / self.completed * 1000
+                if self.completed
+                else 0.0
+            ),
+            "max_wait_ms": self.max_wait_seconds * 1000,
+            "wait_seconds": self.total_wait_seconds,
+            "hash_seconds": self.total_hash_seconds,
+            "avg_hash_ms": (
+                self.total_hash_seconds / self.completed * 1000
+                if self.completed
+                else 0.0
+            ),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=HASH_POOL_WORKERS, max_queue=HASH_POOL_MAX_QUEUE, kind=HASH_POOL_KIND
+)
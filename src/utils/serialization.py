@@ -0,0 +1,72 @@
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import Row
+from typing import Any, Iterable
+
+from ..models import Tasks
+from ..request_response_schemas import TaskRow
+from .request_stats import timed
+
+try:
+    import orjson
+except ImportError:  # optional: the TypeAdapter serializers are the fallback
+    orjson = None
+
+# Selecting columns instead of the entity skips ORM identity-map bookkeeping;
+# the order matches TaskResponse's field order.
+TASK_ROW_COLUMNS = (
+    Tasks.title,
+    Tasks.details,
+    Tasks.priority,
+    Tasks.is_complete,
+    Tasks.id,
+    Tasks.owner_id,
+)
+
+# Built once at import; dump_json serializes without validating
+task_row_adapter = TypeAdapter(TaskRow)
+task_rows_adapter = TypeAdapter(list[TaskRow])
+
+
+def task_rows(rows: Iterable[Row[Any]]) -> list[TaskRow]:
+    return [row._asdict() for row in rows]  # type: ignore[misc]
+
+
+def dump_task_rows(rows: list[TaskRow]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(rows)
+    return task_rows_adapter.dump_json(rows)
+
+
+def dump_task_row(row: TaskRow) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(row)
+    return task_row_adapter.dump_json(row)
+
+
+def dump_task_rows_ndjson(rows: list[TaskRow]) -> bytes:
+    if orjson is not None:
+        return b"".join(
+            orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in rows
+        )
+    return b"".join(task_row_adapter.dump_json(row) + b"\n" for row in rows)
+
+
+class TaskRowsResponse(Response):
+    """JSON response for a list of TaskRow that bypasses response_model."""
+
+    media_type = "application/json"
+
+    def render(self, content: list[TaskRow]) -> bytes:
+        with timed("serialize"):
+            return dump_task_rows(content)
+
+
+class TaskRowResponse(Response):
+    """JSON response for one TaskRow that bypasses response_model."""
+
+    media_type = "application/json"
+
+    def render(self, content: TaskRow) -> bytes:
+        with timed("serialize"):
+            return dump_task_row(content)
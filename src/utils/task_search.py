@@ -0,0 +1,69 @@
+from sqlalchemy import Select, and_, column, func, literal_column, or_, select, table
+from sqlalchemy.dialects.postgresql import TSVECTOR
+import re
+
+from ..models import SEARCH_CONFIG, SEARCH_FTS_TABLE, SEARCH_VECTOR_COLUMN, Tasks
+from .serialization import TASK_ROW_COLUMNS
+
+# Weights of title and details matches on SQLite (PostgreSQL's defaults for the
+# A and B weights the search_vector column gives them)
+TITLE_WEIGHT = 1.0
+DETAILS_WEIGHT = 0.4
+
+_WORD = re.compile(r"\w+")
+
+
+def search_terms(q: str) -> list[str]:
+    """The words of a search string; tasks must contain all of them. Anything
+    else (quotes, operators...) is dropped, so input is never query syntax."""
+    return _WORD.findall(q.lower())
+
+
+def build_task_search_query(dialect: str, owner_id: int, terms: list[str]) -> Select:
+    """
+    An owner's tasks matching every term, best match first (ties by id), as
+    an indexed full-text query: the GIN-indexed `search_vector` column on
+    PostgreSQL, the FTS5 table on SQLite (both created with the tasks table,
+    see models.py). Other dialects fall back to unranked substring matching.
+    """
+    owned = Tasks.owner_id == owner_id
+
+    if dialect == "postgresql":
+        vector = literal_column(
+            f"{Tasks.__tablename__}.{SEARCH_VECTOR_COLUMN}", TSVECTOR
+        )
+        tsquery = func.plainto_tsquery(SEARCH_CONFIG, " ".join(terms))
+        rank = func.ts_rank(vector, tsquery)  # title is weight A, details B
+        return (
+            select(*TASK_ROW_COLUMNS)
+            .where(owned, vector.op("@@")(tsquery))
+            .order_by(rank.desc(), Tasks.id)
+        )
+
+    if dialect == "sqlite":
+        fts = table(SEARCH_FTS_TABLE, column("rowid"))
+        fts_table = literal_column(SEARCH_FTS_TABLE)
+        # Quoted terms are plain strings to FTS5, never operators
+        match = " ".join(f'"{term}"' for term in terms)
+        rank = func.bm25(fts_table, TITLE_WEIGHT, DETAILS_WEIGHT)  # lower is better
+        return (
+            select(*TASK_ROW_COLUMNS)
+            .select_from(fts)
+            .join(Tasks, Tasks.id == fts.c.rowid)
+            .where(owned, fts_table.match(match))
+            .order_by(rank, Tasks.id)
+        )
+
+    return (
+        select(*TASK_ROW_COLUMNS)
+        .where(
+            owned,
+            and_(
+                *(
+                    or_(Tasks.title.icontains(term), Tasks.details.icontains(term))
+                    for term in terms
+                )
+            ),
+        )
+        .order_by(Tasks.id)
+    )
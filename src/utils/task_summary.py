@@ -0,0 +1,112 @@
+from collections import Counter
+from typing import Iterable
+from sqlalchemy import Executable, case, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import TaskSummaries, Tasks, Users
+
+PRIORITIES = range(1, 6)
+COUNTER_COLUMNS = ("total", "completed", *(f"priority_{p}" for p in PRIORITIES))
+
+# session.info key of the counter changes made in the current transaction
+SUMMARY_DELTA_KEY = "task_summary_delta"
+
+
+def summary_delta(
+    tasks: Iterable[tuple[int | None, bool | None]], sign: int = 1
+) -> Counter:
+    """Counter changes for adding (`sign=1`) or removing (`-1`) tasks, given
+    as (priority, is_complete) pairs."""
+    delta = Counter()
+    for priority, is_complete in tasks:
+        delta["total"] += sign
+        if is_complete:
+            delta["completed"] += sign
+        if priority in PRIORITIES:
+            delta[f"priority_{priority}"] += sign
+    return delta
+
+
+def track_summary_delta(db_session: AsyncSession, delta: Counter) -> None:
+    """Records counter changes, to be written by flush_task_summary."""
+    db_session.info.setdefault(SUMMARY_DELTA_KEY, Counter()).update(delta)
+
+
+def _upsert(dialect: str, owner_id: int, values: dict[str, int]) -> Executable:
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+    query = dialect_insert[dialect](TaskSummaries).values(owner_id=owner_id, **values)
+    return query.on_conflict_do_update(
+        index_elements=[TaskSummaries.owner_id],
+        set_={
+            column: getattr(TaskSummaries, column) + query.excluded[column]
+            for column in values
+        },
+    )
+
+
+async def flush_task_summary(db_session: AsyncSession, owner_id: int) -> None:
+    """
+    Adds the counter changes tracked in this transaction to the owner's row
+    (created on first use) in one upsert. Run it in the write's transaction,
+    after bump_tasks_version: that row lock orders it against a repair.
+    """
+    delta = db_session.info.pop(SUMMARY_DELTA_KEY, None) or {}
+    values = {column: value for column, value in delta.items() if value}
+    if not values:
+        return
+
+    dialect = db_session.bind.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        await db_session.execute(_upsert(dialect, owner_id, values))
+        return
+
+    # No single-statement upsert on this dialect
+    result = await db_session.execute(
+        update(TaskSummaries)
+        .where(TaskSummaries.owner_id == owner_id)
+        .values(
+            {
+                column: getattr(TaskSummaries, column) + value
+                for column, value in values.items()
+            }
+        )
+    )
+    if result.rowcount == 0:
+        await db_session.execute(
+            insert(TaskSummaries).values(owner_id=owner_id, **values)
+        )
+
+
+async def recompute_task_summaries(
+    db_session: AsyncSession, owner_id: int | None = None
+) -> int:
+    """
+    Rebuilds the counters of one owner (or all of them) from `tasks`; returns
+    how many owners have tasks. The owners' users rows are locked first, so
+    concurrent task writes wait for the repair (or it waits for them) rather
+    than being lost. Caller commits.
+    """
+    owners = select(Users.id).with_for_update()
+    counts = (
+        select(
+            Tasks.owner_id,
+            func.count(),
+            func.sum(case((Tasks.is_complete.is_(True), 1), else_=0)),
+            *(func.sum(case((Tasks.priority == p, 1), else_=0)) for p in PRIORITIES),
+        )
+        .where(Tasks.owner_id.is_not(None))
+        .group_by(Tasks.owner_id)
+    )
+    stale = delete(TaskSummaries)
+    if owner_id is not None:
+        owners = owners.where(Users.id == owner_id)
+        counts = counts.where(Tasks.owner_id == owner_id)
+        stale = stale.where(TaskSummaries.owner_id == owner_id)
+
+    await db_session.execute(owners)
+    await db_session.execute(stale)
+    result = await db_session.execute(
+        insert(TaskSummaries).from_select(["owner_id", *COUNTER_COLUMNS], counts)
+    )
+    return result.rowcount